@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Offline pipeline benchmark
+Runs scrape + processing (optionally LLM analysis or the Flask /analyze route)
+against the replay backend, so timings are reproducible without network access.
+
+Examples:
+    python benchmark.py --users 5 --posts 300 --comments 1000
+    python benchmark.py --users 20 --concurrency 4 --latency-ms 400
+    python benchmark.py --users 4 --server          # load-test server.py (needs LLM keys)
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the persona pipeline against recorded or synthetic Reddit data')
+    parser.add_argument('--fixtures', help='Fixture directory (default: generate synthetic users in a temp dir)')
+    parser.add_argument('--record', nargs='+', metavar='USERNAME', help='Record live users into --fixtures and exit')
+    parser.add_argument('--users', type=int, default=3, help='Synthetic users to generate')
+    parser.add_argument('--posts', type=int, default=100, help='Posts per synthetic user')
+    parser.add_argument('--comments', type=int, default=200, help='Comments per synthetic user')
+    parser.add_argument('--latency-ms', type=float, default=250, help='Simulated latency per request')
+    parser.add_argument('--jitter-ms', type=float, default=100, help='Random extra latency per request')
+    parser.add_argument('--rate-limit', type=int, default=1000, help='Requests per window reported in X-Ratelimit headers')
+    parser.add_argument('--rate-window', type=float, default=600, help='Rate limit window in seconds')
+    parser.add_argument('--concurrency', type=int, default=1, help='Users processed in parallel')
+    parser.add_argument('--llm', action='store_true', help='Also run PersonaAnalyzer (needs LLM keys)')
+    parser.add_argument('--server', action='store_true', help='Drive POST /analyze on server.py instead')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.record:
+        if not args.fixtures:
+            sys.exit('--record needs --fixtures')
+        from config import MAX_POSTS, MAX_COMMENTS
+        from src.reddit_scraper import get_reddit_client
+        from src.replay_backend import record_user
+
+        for username in args.record:
+            print(f"Recorded {record_user(get_reddit_client(), username, args.fixtures, MAX_POSTS, MAX_COMMENTS)}")
+        return
+
+    fixtures = args.fixtures
+    usernames = []
+    if not fixtures:
+        from src.replay_backend import generate_synthetic_user, write_fixture
+
+        fixtures = tempfile.mkdtemp(prefix='persona-replay-')
+        for i in range(args.users):
+            fixture = generate_synthetic_user(f'bench_user_{i}', args.posts, args.comments, seed=i)
+            write_fixture(fixtures, fixture)
+            usernames.append(fixture['about']['name'])
+    else:
+        usernames = sorted(name[:-5] for name in os.listdir(fixtures) if name.endswith('.json'))
+
+    # Settings are read from the environment when config is imported
+    os.environ.update({
+        'SCRAPE_BACKEND': 'replay',
+        'REPLAY_FIXTURES_DIR': fixtures,
+        'REPLAY_LATENCY_MS': str(args.latency_ms),
+        'REPLAY_JITTER_MS': str(args.jitter_ms),
+        'REPLAY_RATE_LIMIT': str(args.rate_limit),
+        'REPLAY_RATE_WINDOW': str(args.rate_window),
+        'CORPUS_CACHE_TTL': '0',
+        'INCREMENTAL_SCRAPE': 'false',
+        'MAX_POSTS': str(max(args.posts, int(os.getenv('MAX_POSTS', '100')))),
+        'MAX_COMMENTS': str(max(args.comments, int(os.getenv('MAX_COMMENTS', '200')))),
+    })
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.server:
+        run = _server_runner()
+    else:
+        run = _pipeline_runner(args.llm)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(run, usernames))
+    wall = time.perf_counter() - started
+
+    _report(results, wall)
+
+
+def _pipeline_runner(with_llm: bool):
+    from config import STREAMING_PIPELINE
+    from src.data_processor import DataProcessor
+    from src.reddit_scraper import RedditScraper
+
+    analyzer = None
+    if with_llm:
+        from src.persona_analyzer import PersonaAnalyzer
+        analyzer = PersonaAnalyzer()
+
+    def run(username):
+        timings = {}
+        scraper = RedditScraper()
+        processor = DataProcessor()
+
+        t0 = time.perf_counter()
+        if STREAMING_PIPELINE:
+            stream = scraper.stream_user_data(username)
+            processed = processor.process_user_stream(stream)
+            user_data = stream.result()
+            timings['scrape+process'] = time.perf_counter() - t0
+        else:
+            user_data = scraper.scrape_user_data(username)
+            timings['scrape'] = time.perf_counter() - t0
+            t1 = time.perf_counter()
+            processed = processor.process_user_data(user_data)
+            timings['process'] = time.perf_counter() - t1
+
+        if analyzer:
+            t2 = time.perf_counter()
+            analyzer.analyze_persona(processed)
+            timings['llm'] = time.perf_counter() - t2
+
+        timings['total'] = time.perf_counter() - t0
+        timings['items'] = len(user_data['posts']) + len(user_data['comments'])
+        timings['requests'] = scraper.reddit.request_count
+        return timings
+
+    return run
+
+
+def _server_runner():
+    import server
+
+    client = server.app.test_client()
+
+    def run(username):
+        t0 = time.perf_counter()
+        response = client.post('/analyze', json={'profile_url': username})
+        return {'total': time.perf_counter() - t0, 'status': response.status_code}
+
+    return run
+
+
+def _report(results, wall):
+    print(f"\nUsers: {len(results)}   wall time: {wall:.2f}s")
+    keys = [k for k in results[0] if isinstance(results[0][k], float)]
+    for key in keys:
+        values = [r[key] for r in results]
+        print(f"  {key:<15} mean {statistics.mean(values):7.3f}s   max {max(values):7.3f}s")
+    for key in ('items', 'requests', 'status'):
+        if key in results[0]:
+            print(f"  {key:<15} {[r[key] for r in results]}")
+
+
+if __name__ == "__main__":
+    main()
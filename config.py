@@ -56,16 +56,83 @@ GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
 LLM_PROVIDER = os.getenv('LLM_PROVIDER', 'groq')  # 'groq' or 'google'
 GROQ_MODEL = _resolve_groq_model(os.getenv("GROQ_MODEL"))
 GOOGLE_MODEL = os.getenv('GOOGLE_MODEL', 'gemini-pro')
+# Content-addressed LLM response cache (TTL in seconds; 0 disables)
+LLM_CACHE_DIR = os.getenv('LLM_CACHE_DIR', os.path.join('cache', 'llm'))
+LLM_CACHE_TTL = float(os.getenv('LLM_CACHE_TTL', '604800'))
+LLM_CACHE_MAX_MB = float(os.getenv('LLM_CACHE_MAX_MB', '20'))
+# 'sections': one prompt per persona section; 'single': one JSON prompt for all of them
+PERSONA_PROMPT_MODE = os.getenv('PERSONA_PROMPT_MODE', 'sections').lower()
+# Estimated prompt tokens (excluding the response format) per LLM request; sample content is trimmed to fit
+PROMPT_TOKEN_BUDGET = int(os.getenv('PROMPT_TOKEN_BUDGET', '1000'))
+# Persona sections are requested in parallel; this caps in-flight LLM calls per process
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '6'))
 
 # Scraping Configuration
 MAX_POSTS = int(os.getenv('MAX_POSTS', '100'))
 MAX_COMMENTS = int(os.getenv('MAX_COMMENTS', '200'))
-SCRAPING_DELAY = float(os.getenv('SCRAPING_DELAY', '1.0'))
+# Reddit allows 100 OAuth requests/minute; PRAW pages listings 100 items per request
+REDDIT_REQUESTS_PER_MINUTE = float(os.getenv('REDDIT_REQUESTS_PER_MINUTE', '100'))
+REDDIT_RATE_BURST = int(os.getenv('REDDIT_RATE_BURST', '10'))
+
+# Adaptive depth: treat MAX_POSTS/MAX_COMMENTS as a ceiling and stop paging once a
+# further page moves topic/subreddit/sentiment signals by less than the threshold
+ADAPTIVE_DEPTH = os.getenv('ADAPTIVE_DEPTH', 'False').lower() == 'true'
+ADAPTIVE_MIN_ITEMS = int(os.getenv('ADAPTIVE_MIN_ITEMS', '100'))
+ADAPTIVE_THRESHOLD = float(os.getenv('ADAPTIVE_THRESHOLD', '0.05'))
+
+# Off by default: each worker thread authenticates its own Reddit client first, which
+# usually costs what the overlap saves unless MAX_POSTS/MAX_COMMENTS span several pages
+SCRAPE_CONCURRENT = os.getenv('SCRAPE_CONCURRENT', 'False').lower() == 'true'
+# 'praw' builds full model objects; 'json' decodes listing pages straight into records;
+# 'replay' serves fixture files offline for benchmarks and load tests
+SCRAPE_BACKEND = os.getenv('SCRAPE_BACKEND', 'praw')
+REPLAY_FIXTURES_DIR = os.getenv('REPLAY_FIXTURES_DIR', os.path.join('cache', 'replay'))
+REPLAY_LATENCY_MS = float(os.getenv('REPLAY_LATENCY_MS', '250'))
+REPLAY_JITTER_MS = float(os.getenv('REPLAY_JITTER_MS', '100'))
+# X-Ratelimit budget the replay backend reports: requests per window of seconds
+REPLAY_RATE_LIMIT = int(os.getenv('REPLAY_RATE_LIMIT', '1000'))
+REPLAY_RATE_WINDOW = float(os.getenv('REPLAY_RATE_WINDOW', '600'))
+
+# Incremental scraping: keep seen items on disk and only page until known ones
+INCREMENTAL_SCRAPE = os.getenv('INCREMENTAL_SCRAPE', 'False').lower() == 'true'
+SCRAPE_STORE_DIR = os.getenv('SCRAPE_STORE_DIR', os.path.join('cache', 'scrape_store'))
+
+# Raw corpus cache in front of scrape_user_data (TTL in seconds; 0 disables).
+# Off by default: a hit skips the account check, so deleted or suspended users
+# keep being served until their entry expires
+CORPUS_CACHE_DIR = os.getenv('CORPUS_CACHE_DIR', os.path.join('cache', 'corpus'))
+CORPUS_CACHE_TTL = float(os.getenv('CORPUS_CACHE_TTL', '0'))
+CORPUS_CACHE_MAX_MB = float(os.getenv('CORPUS_CACHE_MAX_MB', '50'))
 
 # Analysis Configuration
 MIN_TEXT_LENGTH = int(os.getenv('MIN_TEXT_LENGTH', '10'))
 MAX_TEXT_LENGTH = int(os.getenv('MAX_TEXT_LENGTH', '4000'))
 CONFIDENCE_THRESHOLD = float(os.getenv('CONFIDENCE_THRESHOLD', '0.7'))
+# Memoized sentiment scores kept per process (LRU by content hash)
+SENTIMENT_CACHE_SIZE = int(os.getenv('SENTIMENT_CACHE_SIZE', '20000'))
+# Clean/score items while later listing pages are still downloading
+STREAMING_PIPELINE = os.getenv('STREAMING_PIPELINE', 'True').lower() == 'true'
+# JSON file mapping topic names to keyword/phrase lists (`prefix*` wildcards allowed)
+TOPIC_TAXONOMY_PATH = os.getenv(
+    'TOPIC_TAXONOMY_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'topic_taxonomy.json')
+)
+# Sorted term/IDF table (see utils/keyword_profile.py) that keyword profiles are scored against
+BACKGROUND_IDF_PATH = os.getenv(
+    'BACKGROUND_IDF_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'background_idf.npy')
+)
+KEYWORD_PROFILE_SIZE = int(os.getenv('KEYWORD_PROFILE_SIZE', '25'))
+# Drop deleted, bot, too-short and (near-)duplicate items before cleaning/NLP
+PREFILTER_ENABLED = os.getenv('PREFILTER_ENABLED', 'True').lower() == 'true'
+# Estimated word-shingle Jaccard similarity at which two items count as near-duplicates
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv('NEAR_DUPLICATE_THRESHOLD', '0.8'))
+# Shard cleaning/scoring of large listings across a process pool (0 workers = CPU count).
+# Batch pipeline only: with STREAMING_PIPELINE on, items are scored one by one as
+# they arrive and this setting has no effect
+PARALLEL_PROCESSING = os.getenv('PARALLEL_PROCESSING', 'False').lower() == 'true'
+PARALLEL_MIN_ITEMS = int(os.getenv('PARALLEL_MIN_ITEMS', '2000'))
+PARALLEL_WORKERS = int(os.getenv('PARALLEL_WORKERS', '0'))
 
 # Output Configuration
 OUTPUT_DIR = os.getenv('OUTPUT_DIR', 'output')
@@ -80,10 +147,12 @@ def validate_config():
     """Validate that all required configuration is present."""
     missing = []
 
-    if not REDDIT_CLIENT_ID:
-        missing.append("REDDIT_CLIENT_ID")
-    if not REDDIT_CLIENT_SECRET:
-        missing.append("REDDIT_CLIENT_SECRET")
+    # The offline replay backend never talks to Reddit
+    if SCRAPE_BACKEND.strip().lower() != "replay":
+        if not REDDIT_CLIENT_ID:
+            missing.append("REDDIT_CLIENT_ID")
+        if not REDDIT_CLIENT_SECRET:
+            missing.append("REDDIT_CLIENT_SECRET")
 
     if LLM_PROVIDER == "groq":
         if not GROQ_API_KEY:
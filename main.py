@@ -20,7 +20,7 @@ except LookupError:
 # Add src directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from config import validate_config, OUTPUT_DIR, LOG_LEVEL
+from config import validate_config, OUTPUT_DIR, LOG_LEVEL, STREAMING_PIPELINE
 from src.reddit_scraper import RedditScraper
 from src.data_processor import DataProcessor
 from src.persona_analyzer import PersonaAnalyzer
@@ -76,15 +76,24 @@ def main():
         citation_manager = CitationManager()
         output_generator = OutputGenerator()
         
-        # Step 1: Scrape Reddit data
-        logger.info("Starting Reddit data scraping...")
-        user_data = scraper.scrape_user_data(username)
-        logger.info(f"Scraped {len(user_data['posts'])} posts and {len(user_data['comments'])} comments")
-        
-        # Step 2: Process data
-        logger.info("Processing scraped data...")
-        processed_data = processor.process_user_data(user_data)
-        logger.info("Data processing completed")
+        if STREAMING_PIPELINE:
+            # Steps 1+2: Scrape and process concurrently, page by page
+            logger.info("Starting streaming Reddit scrape and processing...")
+            stream = scraper.stream_user_data(username)
+            processed_data = processor.process_user_stream(stream)
+            user_data = stream.result()
+            logger.info(f"Scraped {len(user_data['posts'])} posts and {len(user_data['comments'])} comments")
+            logger.info("Data processing completed")
+        else:
+            # Step 1: Scrape Reddit data
+            logger.info("Starting Reddit data scraping...")
+            user_data = scraper.scrape_user_data(username)
+            logger.info(f"Scraped {len(user_data['posts'])} posts and {len(user_data['comments'])} comments")
+            
+            # Step 2: Process data
+            logger.info("Processing scraped data...")
+            processed_data = processor.process_user_data(user_data)
+            logger.info("Data processing completed")
         
         # Step 3: Analyze persona
         logger.info("Analyzing user persona...")
@@ -15,7 +15,7 @@ import nltk
 from flask import Flask, jsonify, request, send_from_directory
 from flask_cors import CORS
 
-from config import OUTPUT_DIR, validate_config
+from config import OUTPUT_DIR, STREAMING_PIPELINE, validate_config
 
 # Web API: default off — avoids writing to ephemeral disk on Railway; clients use sessionStorage.
 PERSONA_WRITE_TO_DISK = os.getenv("PERSONA_WRITE_TO_DISK", "false").lower() in (
@@ -77,6 +77,20 @@ def health():
     return jsonify({"status": "ok"}), 200
 
 
+@app.route("/ready")
+@app.route("/readyz")
+def ready():
+    """Readiness: config is valid and Reddit accepts our credentials."""
+    try:
+        validate_config()
+    except ValueError as e:
+        return jsonify({"status": "unavailable", "error": str(e)}), 503
+
+    if not RedditScraper().check_ready():
+        return jsonify({"status": "unavailable", "error": "Reddit API authentication failed"}), 503
+    return jsonify({"status": "ready"}), 200
+
+
 @app.route("/analyze", methods=["POST"])
 def analyze():
     if not request.is_json:
@@ -105,17 +119,23 @@ def analyze():
         citation_manager = CitationManager()
         output_generator = OutputGenerator()
 
-        logger.info("Starting Reddit data scraping...")
-        user_data = scraper.scrape_user_data(username)
+        if STREAMING_PIPELINE:
+            logger.info("Starting streaming Reddit scrape and processing...")
+            stream = scraper.stream_user_data(username)
+            processed_data = processor.process_user_stream(stream)
+            user_data = stream.result()
+        else:
+            logger.info("Starting Reddit data scraping...")
+            user_data = scraper.scrape_user_data(username)
+
+            logger.info("Processing scraped data...")
+            processed_data = processor.process_user_data(user_data)
         logger.info(
             "Scraped %s posts and %s comments",
             len(user_data["posts"]),
             len(user_data["comments"]),
         )
 
-        logger.info("Processing scraped data...")
-        processed_data = processor.process_user_data(user_data)
-
         logger.info("Analyzing user persona...")
         persona_data = analyzer.analyze_persona(processed_data)
 
@@ -146,6 +166,7 @@ def analyze():
                 "file_path": saved_path,
                 "persona_content": persona_content,
                 "persisted_to_disk": PERSONA_WRITE_TO_DISK,
+                "llm_cache": persona_data.get("llm_cache"),
             }
         )
 
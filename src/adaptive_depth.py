@@ -0,0 +1,112 @@
+"""
+Adaptive Depth Module
+Stops listing pagination once extra pages no longer change the user's profile
+"""
+
+import logging
+import math
+import threading
+from collections import Counter
+from typing import Dict, Optional
+
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from utils.topic_matcher import get_topic_matcher
+
+# Items between snapshots; stopping itself waits for a page boundary
+SNAPSHOT_EVERY = 25
+
+_lexicon: Optional[Dict[str, float]] = None
+_lexicon_lock = threading.Lock()
+
+
+def _vader_lexicon() -> Dict[str, float]:
+    global _lexicon
+    with _lexicon_lock:
+        if _lexicon is None:
+            _lexicon = SentimentIntensityAnalyzer().lexicon
+        return _lexicon
+
+
+def _lexicon_polarity(text: str) -> float:
+    """
+    Sum of VADER lexicon valences, normalised like VADER's compound score
+
+    Skips VADER's negation, booster and punctuation rules: a fraction of the
+    cost of polarity_scores(), and enough to follow the drift of the mean.
+    """
+    lexicon = _vader_lexicon()
+    total = 0.0
+    for word in text.split():
+        total += lexicon.get(word.strip('.,!?;:"()[]'), 0.0)
+    return total / math.sqrt(total * total + 15) if total else 0.0
+
+
+def _total_variation(current: Counter, previous: Counter) -> float:
+    """Half the L1 distance between two normalised distributions (0 = identical, 1 = disjoint)"""
+    current_total = sum(current.values())
+    previous_total = sum(previous.values())
+    if not current_total or not previous_total:
+        return 0.0 if current_total == previous_total else 1.0
+
+    keys = set(current) | set(previous)
+    return sum(abs(current[k] / current_total - previous[k] / previous_total) for k in keys) / 2
+
+
+class ConvergenceMonitor:
+    """
+    Tracks cheap profile signals for one listing as items arrive
+
+    Every `check_every` items the topic distribution, subreddit distribution
+    and mean sentiment are compared with the previous snapshot. Paging stops
+    at the first page boundary at or past `min_items` where the largest
+    change since the previous snapshot is below the threshold, so no request
+    is cut short and the next page is never fetched.
+    """
+
+    def __init__(self, min_items: int, threshold: float, page_size: int,
+                 check_every: int = SNAPSHOT_EVERY):
+        self.logger = logging.getLogger(__name__)
+        self.min_items = min_items
+        self.threshold = threshold
+        self.page_size = max(1, page_size)
+        self.check_every = max(1, min(check_every, self.page_size))
+
+        self.count = 0
+        self.last_delta: Optional[float] = None
+        self._topics = Counter()
+        self._subreddits = Counter()
+        self._sentiment_sum = 0.0
+        self._snapshot: Optional[Dict] = None
+
+    def add(self, item: Dict):
+        """Fold one scraped post/comment record into the running signals"""
+        text = f"{item.get('title', '')} {item.get('text', '')}".lower()
+
+        self._topics.update(get_topic_matcher().count(text))
+        self._subreddits[item.get('subreddit', 'unknown')] += 1
+        self._sentiment_sum += _lexicon_polarity(text)
+        self.count += 1
+
+    def should_stop(self) -> bool:
+        """True at a page boundary when the last snapshot added less than `threshold` of new information"""
+        if self.count % self.check_every and self.count % self.page_size:
+            return False
+
+        snapshot = {
+            'topics': Counter(self._topics),
+            'subreddits': Counter(self._subreddits),
+            'sentiment': self._sentiment_sum / self.count
+        }
+        previous = self._snapshot
+        self._snapshot = snapshot
+        if previous is not None:
+            self.last_delta = max(
+                _total_variation(snapshot['topics'], previous['topics']),
+                _total_variation(snapshot['subreddits'], previous['subreddits']),
+                abs(snapshot['sentiment'] - previous['sentiment']) / 2  # compound spans [-1, 1]
+            )
+
+        if self.count % self.page_size or self.count < self.min_items or self.last_delta is None:
+            return False
+        return self.last_delta < self.threshold
@@ -3,23 +3,34 @@ Data Processing Module
 Handles data cleaning, preprocessing, and feature extraction
 """
 
-import re
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
+import numpy as np
 import pandas as pd
-from textblob import TextBlob
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 from config import MIN_TEXT_LENGTH, MAX_TEXT_LENGTH
-from utils.text_utils import clean_text, extract_keywords, calculate_readability
+from src.sentiment_engine import get_sentiment_engine
+from src.item_store import ItemRow, ItemStore
+from src.parallel_nlp import run_sharded
+from utils.keyword_profile import TermMatrix, distinctive_terms, get_background_idf
+from utils.prefilter import PreFilter
+from utils.text_stats import TextStats
+from utils.text_utils import clean_texts
+from utils.topic_matcher import get_topic_matcher
+
+# Upper edges (seconds) of the gap buckets reported in activity_detail
+GAP_BUCKET_EDGES = [3600, 6 * 3600, 86400, 7 * 86400]
+GAP_BUCKET_LABELS = ['<1h', '1-6h', '6-24h', '1-7d', '>7d']
+
 
 class DataProcessor:
     """Handles data cleaning and preprocessing"""
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.sentiment_analyzer = SentimentIntensityAnalyzer()
+        self.sentiment_engine = get_sentiment_engine()
+        self.topic_matcher = get_topic_matcher()
         
     def process_user_data(self, user_data: Dict) -> Dict:
         """
@@ -32,168 +43,199 @@ class DataProcessor:
             Processed user data
         """
         try:
+            post_filter, comment_filter = PreFilter(), PreFilter()
+            
             # Clean and filter posts
-            processed_posts = self._process_posts(user_data.get('posts', []))
+            processed_posts = self._process_posts(user_data.get('posts', []), post_filter)
             
             # Clean and filter comments
-            processed_comments = self._process_comments(user_data.get('comments', []))
-            
-            # Combine all text for analysis
-            combined_text = self._combine_text(processed_posts, processed_comments)
-            
-            # Extract features
-            features = self._extract_features(combined_text, processed_posts, processed_comments)
+            processed_comments = self._process_comments(user_data.get('comments', []), comment_filter)
             
-            # Analyze sentiment patterns
-            sentiment_patterns = self._analyze_sentiment_patterns(processed_posts, processed_comments)
-            
-            # Extract topics and interests
-            topics = self._extract_topics(combined_text)
-            
-            # Calculate activity patterns
-            activity_patterns = self._analyze_activity_patterns(processed_posts, processed_comments)
-            
-            return {
-                'username': user_data.get('username'),
-                'user_info': user_data.get('user_info', {}),
-                'posts': processed_posts,
-                'comments': processed_comments,
-                'combined_text': combined_text,
-                'features': features,
-                'sentiment_patterns': sentiment_patterns,
-                'topics': topics,
-                'activity_patterns': activity_patterns,
-                'processed_at': datetime.now().isoformat()
-            }
+            return self._finalize(user_data, processed_posts, processed_comments, post_filter, comment_filter)
             
         except Exception as e:
             self.logger.error(f"Error processing user data: {str(e)}")
             raise
     
-    def _process_posts(self, posts: List[Dict]) -> List[Dict]:
-        """Process and clean posts"""
-        processed_posts = []
+    def process_user_stream(self, stream) -> Dict:
+        """
+        Process items while the scraper is still fetching later pages
         
-        for post in posts:
-            # Clean title and text
-            clean_title = clean_text(post.get('title', ''))
-            clean_text_content = clean_text(post.get('text', ''))
-            
-            # Skip if too short or too long
-            total_text = f"{clean_title} {clean_text_content}"
-            if len(total_text) < MIN_TEXT_LENGTH or len(total_text) > MAX_TEXT_LENGTH:
-                continue
-            
-            # Calculate sentiment
-            sentiment = self._calculate_sentiment(total_text)
+        Per-item cleaning and sentiment run as each record arrives, in this
+        process (PARALLEL_PROCESSING only applies to process_user_data);
+        aggregate features, topics and activity patterns are computed once
+        the stream ends.
+        Which copy of a duplicate comes first is only known once the final
+        ordering is, so streamed duplicates are processed and dropped at the
+        end; the keys of every screened item are kept for that, so the result
+        matches deduplicating before processing as process_user_data does.
+        
+        Args:
+            stream: ScrapeStream from RedditScraper.stream_user_data; it is
+                cancelled if processing fails
             
-            # Extract keywords
-            keywords = extract_keywords(total_text)
+        Returns:
+            Processed user data, identical to process_user_data on the same corpus
+        """
+        try:
+            from config import PARALLEL_PROCESSING
             
-            processed_post = {
-                **post,
-                'clean_title': clean_title,
-                'clean_text': clean_text_content,
-                'total_text': total_text,
-                'text_length': len(total_text),
-                'sentiment': sentiment,
-                'keywords': keywords,
-                'readability': calculate_readability(total_text),
-                'timestamp': datetime.fromtimestamp(post.get('created_utc', 0))
-            }
+            if PARALLEL_PROCESSING:
+                self.logger.warning(
+                    "PARALLEL_PROCESSING has no effect on the streaming pipeline; "
+                    "set STREAMING_PIPELINE=false to shard processing across processes"
+                )
             
-            processed_posts.append(processed_post)
-        
-        return processed_posts
-    
-    def _process_comments(self, comments: List[Dict]) -> List[Dict]:
-        """Process and clean comments"""
-        processed_comments = []
-        
-        for comment in comments:
-            # Clean text
-            clean_text_content = clean_text(comment.get('text', ''))
+            processed_posts = ItemStore('post')
+            processed_comments = ItemStore('comment')
+            post_filter, comment_filter = PreFilter(), PreFilter()
+            post_keys: Dict[str, str] = {}
+            comment_keys: Dict[str, str] = {}
             
-            # Skip if too short or too long
-            if len(clean_text_content) < MIN_TEXT_LENGTH or len(clean_text_content) > MAX_TEXT_LENGTH:
-                continue
+            for item in stream:
+                if item.get('type') == 'comment':
+                    self._process_comment(processed_comments, item, comment_filter, comment_keys)
+                else:
+                    self._process_post(processed_posts, item, post_filter, post_keys)
             
-            # Calculate sentiment
-            sentiment = self._calculate_sentiment(clean_text_content)
+            user_data = stream.result()
             
-            # Extract keywords
-            keywords = extract_keywords(clean_text_content)
+            # Items arrive in completion order; dedupe and restore the scraper's final ordering
+            posts, comments = user_data.get('posts', []), user_data.get('comments', [])
+            processed_posts = self._reorder(processed_posts, posts, self._dedupe(posts, post_keys, post_filter))
+            processed_comments = self._reorder(
+                processed_comments, comments, self._dedupe(comments, comment_keys, comment_filter)
+            )
             
-            processed_comment = {
-                **comment,
-                'clean_text': clean_text_content,
-                'text_length': len(clean_text_content),
-                'sentiment': sentiment,
-                'keywords': keywords,
-                'readability': calculate_readability(clean_text_content),
-                'timestamp': datetime.fromtimestamp(comment.get('created_utc', 0))
-            }
+            return self._finalize(user_data, processed_posts, processed_comments, post_filter, comment_filter)
             
-            processed_comments.append(processed_comment)
-        
-        return processed_comments
+        except Exception as e:
+            self.logger.error(f"Error processing user stream: {str(e)}")
+            raise
+        finally:
+            # A no-op once the scrape has finished; otherwise stop paging for a failed request
+            stream.cancel()
+    
+    @staticmethod
+    def _reorder(processed: ItemStore, raw_items: List[Dict], kept_ids: Set[str]) -> ItemStore:
+        order = {item['id']: i for i, item in enumerate(raw_items) if item['id'] in kept_ids}
+        rows = [i for i, record in enumerate(processed.records) if record['id'] in order]
+        return processed.take(sorted(rows, key=lambda i: order[processed.records[i]['id']]))
+    
+    @staticmethod
+    def _dedupe(raw_items: List[Dict], keys: Dict[str, str], prefilter: PreFilter) -> Set[str]:
+        """Ids of screened items (id -> key()) not duplicating an earlier one in raw_items order"""
+        ids = [item['id'] for item in raw_items if item['id'] in keys]
+        return {ids[i] for i in prefilter.dedupe([keys[item_id] for item_id in ids])}
     
-    def _combine_text(self, posts: List[Dict], comments: List[Dict]) -> str:
-        """Combine all text content"""
-        all_text = []
+    def _finalize(self, user_data: Dict, processed_posts: ItemStore, processed_comments: ItemStore,
+                  post_filter: PreFilter, comment_filter: PreFilter) -> Dict:
+        """Compute corpus-level aggregates over processed items"""
+        prefilter = {'posts': post_filter.report(), 'comments': comment_filter.report()}
+        for kind, report in prefilter.items():
+            reasons = ', '.join(f"{count} {reason}" for reason, count in report['dropped'].items() if count)
+            self.logger.info(f"Pre-filter kept {report['kept']}/{report['checked']} {kind}"
+                             + (f" (dropped {reasons})" if reasons else ""))
         
-        for post in posts:
-            all_text.append(post.get('total_text', ''))
+        # Extract features
+        features = self._extract_features(processed_posts, processed_comments)
         
-        for comment in comments:
-            all_text.append(comment.get('clean_text', ''))
+        # Analyze sentiment patterns
+        sentiment_patterns = self._analyze_sentiment_patterns(processed_posts, processed_comments)
         
-        return '\n\n'.join(all_text)
-    
-    def _calculate_sentiment(self, text: str) -> Dict:
-        """Calculate sentiment using VADER"""
-        scores = self.sentiment_analyzer.polarity_scores(text)
+        # Extract topics and interests
+        topics = self._extract_topics(processed_posts, processed_comments)
+        
+        # Distinctive vocabulary against the background IDF table
+        keyword_profile = self._extract_keyword_profile(processed_posts, processed_comments)
         
-        # Also use TextBlob for additional analysis
-        blob = TextBlob(text)
+        # Calculate activity patterns
+        activity_patterns, activity_detail = self._analyze_activity(processed_posts, processed_comments)
+        
+        stats = self.sentiment_engine.stats()
+        self.logger.info(
+            f"Sentiment engine totals: {stats['texts']} texts, {stats['cache_hits']} cache hits, "
+            f"VADER {stats['vader_seconds']:.2f}s/{stats['vader_calls']} calls, "
+            f"TextBlob {stats['textblob_seconds']:.2f}s/{stats['textblob_calls']} calls"
+        )
         
         return {
-            'vader_compound': scores['compound'],
-            'vader_positive': scores['pos'],
-            'vader_negative': scores['neg'],
-            'vader_neutral': scores['neu'],
-            'textblob_polarity': blob.sentiment.polarity,
-            'textblob_subjectivity': blob.sentiment.subjectivity
+            'username': user_data.get('username'),
+            'user_info': user_data.get('user_info', {}),
+            'posts': processed_posts,
+            'comments': processed_comments,
+            'features': features,
+            'sentiment_patterns': sentiment_patterns,
+            'topics': topics,
+            'keyword_profile': keyword_profile,
+            'activity_patterns': activity_patterns,
+            'activity_detail': activity_detail,
+            'prefilter': prefilter,
+            'processed_at': datetime.now().isoformat()
         }
     
-    def _extract_features(self, text: str, posts: List[Dict], comments: List[Dict]) -> Dict:
+    def _process_posts(self, posts: List[Dict], prefilter: PreFilter) -> ItemStore:
+        """Process and clean posts"""
+        screened = [(post, prefilter.screen(post.get('title', ''), post.get('text', ''))) for post in posts]
+        screened = [(post, pair) for post, pair in screened if pair]
+        kept = [screened[i] for i in prefilter.dedupe([prefilter.key(*pair) for _, pair in screened])]
+        
+        store = ItemStore('post')
+        rows = run_sharded(analyze_posts, [pair for _, pair in kept])
+        for (post, _), row in zip(kept, rows):
+            if row:
+                store.append_row(post, row)
+        return store
+    
+    def _process_post(self, store: ItemStore, post: Dict, prefilter: PreFilter, keys: Dict[str, str]):
+        """Clean and score a single post into the store, unless it is filtered out"""
+        pair = prefilter.screen(post.get('title', ''), post.get('text', ''))
+        if not pair:
+            return
+        keys[post['id']] = prefilter.key(*pair)
+        row = analyze_posts([pair])[0]
+        if row:
+            store.append_row(post, row)
+    
+    def _process_comments(self, comments: List[Dict], prefilter: PreFilter) -> ItemStore:
+        """Process and clean comments"""
+        screened = [(comment, prefilter.screen(None, comment.get('text', ''))) for comment in comments]
+        screened = [(comment, pair[1]) for comment, pair in screened if pair]
+        kept = [screened[i] for i in prefilter.dedupe([text for _, text in screened])]
+        
+        store = ItemStore('comment')
+        rows = run_sharded(analyze_comments, [text for _, text in kept])
+        for (comment, _), row in zip(kept, rows):
+            if row:
+                store.append_row(comment, row)
+        return store
+    
+    def _process_comment(self, store: ItemStore, comment: Dict, prefilter: PreFilter, keys: Dict[str, str]):
+        """Clean and score a single comment into the store, unless it is filtered out"""
+        pair = prefilter.screen(None, comment.get('text', ''))
+        if not pair:
+            return
+        keys[comment['id']] = prefilter.key(None, pair[1])
+        row = analyze_comments([pair[1]])[0]
+        if row:
+            store.append_row(comment, row)
+    
+    def _extract_features(self, posts: ItemStore, comments: ItemStore) -> Dict:
         """Extract various features from the text"""
         
-        # Text statistics
-        word_count = len(text.split())
-        char_count = len(text)
-        sentence_count = len(re.findall(r'[.!?]+', text))
-        
-        # Linguistic features
-        question_count = text.count('?')
-        exclamation_count = text.count('!')
-        caps_ratio = sum(1 for c in text if c.isupper()) / len(text) if text else 0
+        # Text statistics and linguistic features, summed from per-item counts
+        text_stats = posts.text_stats().merge(comments.text_stats())
         
         # Behavioral features
-        avg_post_length = sum(p.get('text_length', 0) for p in posts) / len(posts) if posts else 0
-        avg_comment_length = sum(c.get('text_length', 0) for c in comments) / len(comments) if comments else 0
+        avg_post_length = _column_mean(posts, 'text_length')
+        avg_comment_length = _column_mean(comments, 'text_length')
         
         # Engagement features
-        avg_post_score = sum(p.get('score', 0) for p in posts) / len(posts) if posts else 0
-        avg_comment_score = sum(c.get('score', 0) for c in comments) / len(comments) if comments else 0
+        avg_post_score = _column_mean(posts, 'score')
+        avg_comment_score = _column_mean(comments, 'score')
         
         return {
-            'word_count': word_count,
-            'char_count': char_count,
-            'sentence_count': sentence_count,
-            'question_ratio': question_count / sentence_count if sentence_count > 0 else 0,
-            'exclamation_ratio': exclamation_count / sentence_count if sentence_count > 0 else 0,
-            'caps_ratio': caps_ratio,
+            **text_stats.features(),
             'avg_post_length': avg_post_length,
             'avg_comment_length': avg_comment_length,
             'avg_post_score': avg_post_score,
@@ -201,52 +243,31 @@ class DataProcessor:
             'post_to_comment_ratio': len(posts) / len(comments) if comments else float('inf')
         }
     
-    def _analyze_sentiment_patterns(self, posts: List[Dict], comments: List[Dict]) -> Dict:
+    def _analyze_sentiment_patterns(self, posts: ItemStore, comments: ItemStore) -> Dict:
         """Analyze sentiment patterns across posts and comments"""
         
-        post_sentiments = [p.get('sentiment', {}) for p in posts]
-        comment_sentiments = [c.get('sentiment', {}) for c in comments]
-        
-        def avg_sentiment(sentiments, key):
-            values = [s.get(key, 0) for s in sentiments if s.get(key) is not None]
-            return sum(values) / len(values) if values else 0
-        
         return {
             'overall_sentiment': {
-                'posts_positive': avg_sentiment(post_sentiments, 'vader_positive'),
-                'posts_negative': avg_sentiment(post_sentiments, 'vader_negative'),
-                'posts_compound': avg_sentiment(post_sentiments, 'vader_compound'),
-                'comments_positive': avg_sentiment(comment_sentiments, 'vader_positive'),
-                'comments_negative': avg_sentiment(comment_sentiments, 'vader_negative'),
-                'comments_compound': avg_sentiment(comment_sentiments, 'vader_compound')
+                'posts_positive': _column_mean(posts, 'vader_positive'),
+                'posts_negative': _column_mean(posts, 'vader_negative'),
+                'posts_compound': _column_mean(posts, 'vader_compound'),
+                'comments_positive': _column_mean(comments, 'vader_positive'),
+                'comments_negative': _column_mean(comments, 'vader_negative'),
+                'comments_compound': _column_mean(comments, 'vader_compound')
             },
             'subjectivity': {
-                'posts_avg': avg_sentiment(post_sentiments, 'textblob_subjectivity'),
-                'comments_avg': avg_sentiment(comment_sentiments, 'textblob_subjectivity')
+                'posts_avg': _column_mean(posts, 'textblob_subjectivity'),
+                'comments_avg': _column_mean(comments, 'textblob_subjectivity')
             }
         }
     
-    def _extract_topics(self, text: str) -> Dict:
-        """Extract topics and interests from text"""
-        
-        # Common topic keywords
-        topic_keywords = {
-            'technology': ['tech', 'programming', 'software', 'computer', 'code', 'app', 'digital'],
-            'gaming': ['game', 'gaming', 'play', 'xbox', 'playstation', 'pc', 'steam'],
-            'sports': ['sport', 'team', 'game', 'player', 'season', 'match', 'win'],
-            'politics': ['political', 'government', 'election', 'vote', 'policy', 'democrat', 'republican'],
-            'entertainment': ['movie', 'show', 'tv', 'film', 'actor', 'music', 'band'],
-            'finance': ['money', 'investment', 'stock', 'crypto', 'bitcoin', 'financial', 'economy'],
-            'health': ['health', 'medical', 'doctor', 'fitness', 'exercise', 'diet', 'wellness'],
-            'education': ['school', 'university', 'student', 'learn', 'study', 'education', 'teacher']
-        }
+    def _extract_topics(self, posts: ItemStore, comments: ItemStore) -> Dict:
+        """Extract topics and interests from the per-item taxonomy hits"""
         
-        text_lower = text.lower()
-        topic_scores = {}
-        
-        for topic, keywords in topic_keywords.items():
-            score = sum(text_lower.count(keyword) for keyword in keywords)
-            topic_scores[topic] = score
+        topic_scores = dict.fromkeys(self.topic_matcher.topics, 0)
+        for item_hits in posts.topic_hits + comments.topic_hits:
+            for topic, hits in item_hits.items():
+                topic_scores[topic] = topic_scores.get(topic, 0) + hits
         
         # Get top topics
         sorted_topics = sorted(topic_scores.items(), key=lambda x: x[1], reverse=True)
@@ -257,49 +278,127 @@ class DataProcessor:
             'primary_interest': sorted_topics[0][0] if sorted_topics and sorted_topics[0][1] > 0 else 'general'
         }
     
-    def _analyze_activity_patterns(self, posts: List[Dict], comments: List[Dict]) -> Dict:
-        """Analyze user activity patterns"""
-        
-        all_items = posts + comments
+    def _extract_keyword_profile(self, posts: ItemStore, comments: ItemStore) -> List[Dict]:
+        """
+        Corpus-level TF-IDF keywords over all cleaned posts and comments
         
-        if not all_items:
-            return {}
+        Each entry carries the post/comment ids and permalinks it was found
+        in, so prompts and citations can point back to the source.
+        """
+        from config import KEYWORD_PROFILE_SIZE
+        
+        matrix = TermMatrix(posts.texts() + comments.texts())
+        profile = distinctive_terms(matrix, get_background_idf(), KEYWORD_PROFILE_SIZE)
+        
+        for entry in profile:
+            sources = []
+            for row in entry.pop('rows'):
+                store, index = (posts, row) if row < len(posts) else (comments, row - len(posts))
+                record = store.records[index]
+                sources.append({'type': store.kind, 'id': record.get('id'), 'permalink': record.get('permalink', '')})
+            entry['sources'] = sources
+        return profile
+    
+    def _analyze_activity(self, posts: ItemStore, comments: ItemStore) -> Tuple[Dict, Dict]:
+        """
+        Activity patterns plus finer detail, vectorized over created_utc
         
-        # Time-based analysis
-        timestamps = [item.get('timestamp') for item in all_items if item.get('timestamp')]
+        Times are bucketed in UTC. Returns (activity_patterns, activity_detail);
+        the detail (day x hour heatmap, gaps between items) is kept separate so
+        the prompt-facing patterns stay compact.
+        """
         
-        if not timestamps:
-            return {}
+        total = len(posts) + len(comments)
         
-        # Day of week analysis
-        days = [ts.weekday() for ts in timestamps]
-        day_counts = {i: days.count(i) for i in range(7)}
+        if not total:
+            return {}, {}
         
-        # Hour analysis
-        hours = [ts.hour for ts in timestamps]
-        hour_counts = {i: hours.count(i) for i in range(24)}
+        created = np.concatenate([posts.column('created_utc'), comments.column('created_utc')])
         
-        # Subreddit analysis
-        subreddits = {}
-        for item in all_items:
-            subreddit = item.get('subreddit', 'unknown')
-            subreddits[subreddit] = subreddits.get(subreddit, 0) + 1
+        # Day of week (epoch day 0 was a Thursday; 0=Monday) and hour, as one 7x24 histogram
+        seconds = np.floor(created).astype(np.int64)
+        days = (seconds // 86400 + 3) % 7
+        hours = (seconds % 86400) // 3600
+        heatmap = np.bincount(days * 24 + hours, minlength=168).reshape(7, 24)
+        day_totals = heatmap.sum(axis=1)
+        hour_totals = heatmap.sum(axis=0)
+        day_counts = dict(enumerate(day_totals.tolist()))
+        hour_counts = dict(enumerate(hour_totals.tolist()))
         
-        # Most active times
-        most_active_day = max(day_counts.items(), key=lambda x: x[1])[0]
-        most_active_hour = max(hour_counts.items(), key=lambda x: x[1])[0]
+        # Subreddit analysis, ties kept in first-seen order
+        subreddits = pd.Series(
+            [record.get('subreddit', 'unknown') for record in posts.records + comments.records], dtype=object
+        )
+        subreddit_counts = subreddits.value_counts(sort=False).sort_values(ascending=False, kind='stable')
         
         # Activity consistency
-        activity_variance = sum((count - (len(all_items) / 7))**2 for count in day_counts.values()) / 7
+        activity_variance = float(((day_totals - total / 7) ** 2).sum() / 7)
+        span_days = int((created.max() - created.min()) // 86400)
         
-        return {
-            'total_activity': len(all_items),
+        patterns = {
+            'total_activity': total,
             'posts_vs_comments': len(posts) / len(comments) if comments else float('inf'),
-            'most_active_day': most_active_day,  # 0=Monday, 6=Sunday
-            'most_active_hour': most_active_hour,
+            'most_active_day': int(day_totals.argmax()),  # 0=Monday, 6=Sunday
+            'most_active_hour': int(hour_totals.argmax()),
             'day_distribution': day_counts,
             'hour_distribution': hour_counts,
-            'top_subreddits': sorted(subreddits.items(), key=lambda x: x[1], reverse=True)[:10],
+            'top_subreddits': list(zip(subreddit_counts.index[:10], subreddit_counts.values[:10].tolist())),
             'activity_consistency': 1 / (1 + activity_variance),  # Higher = more consistent
-            'posting_frequency': len(all_items) / max(1, (max(timestamps) - min(timestamps)).days or 1)
-        }
\ No newline at end of file
+            'posting_frequency': total / max(1, span_days or 1)
+        }
+        
+        # Gaps between consecutive items, bucketed
+        gaps = np.diff(np.sort(created))
+        gap_counts = np.bincount(np.searchsorted(GAP_BUCKET_EDGES, gaps, side='right'), minlength=len(GAP_BUCKET_LABELS))
+        detail = {
+            'day_hour_heatmap': heatmap.tolist(),  # [weekday][hour], UTC
+            'gap_distribution': dict(zip(GAP_BUCKET_LABELS, gap_counts.tolist())),
+            'median_gap_hours': float(np.median(gaps)) / 3600 if len(gaps) else None
+        }
+        
+        return patterns, detail
+
+
+def _column_mean(store: ItemStore, name: str) -> float:
+    """Mean of a numeric column over rows where it is set; 0 for an empty store"""
+    values = store.column(name)
+    values = values[~np.isnan(values)]
+    return float(values.mean()) if len(values) else 0
+
+
+def analyze_posts(pairs: List[Tuple[str, str]]) -> List[Optional[ItemRow]]:
+    """
+    Clean, filter and score the (title, text) pairs of a post listing
+    
+    Module-level so it can run in a pool worker. Returns one ItemRow per
+    pair, or None where the post is too short or too long.
+    """
+    # Clean every title and body of the listing in one batch
+    cleaned = clean_texts([title for title, _ in pairs] + [text for _, text in pairs])
+    titles, bodies = cleaned[:len(pairs)], cleaned[len(pairs):]
+    
+    # Skip if too short or too long
+    totals = [f"{title} {body}" for title, body in zip(titles, bodies)]
+    keep = [i for i, total in enumerate(totals) if MIN_TEXT_LENGTH <= len(total) <= MAX_TEXT_LENGTH]
+    
+    return _score_rows(len(pairs), keep, [totals[i] for i in keep], [titles[i] for i in keep], [bodies[i] for i in keep])
+
+
+def analyze_comments(texts: List[str]) -> List[Optional[ItemRow]]:
+    """Comment-listing counterpart of analyze_posts"""
+    cleaned = clean_texts(texts)
+    keep = [i for i, text in enumerate(cleaned) if MIN_TEXT_LENGTH <= len(text) <= MAX_TEXT_LENGTH]
+    kept = [cleaned[i] for i in keep]
+    return _score_rows(len(texts), keep, kept, [None] * len(kept), kept)
+
+
+def _score_rows(count: int, keep: List[int], texts: List[str], titles: List[Optional[str]],
+                bodies: List[str]) -> List[Optional[ItemRow]]:
+    # Score the whole listing in one batch
+    sentiments = get_sentiment_engine().score_batch(texts)
+    matcher = get_topic_matcher()
+    
+    rows: List[Optional[ItemRow]] = [None] * count
+    for i, text, title, body, sentiment in zip(keep, texts, titles, bodies, sentiments):
+        rows[i] = ItemRow(title, body, matcher.count(text), sentiment, TextStats.of(text))
+    return rows
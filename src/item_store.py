@@ -0,0 +1,210 @@
+"""
+Item Store Module
+Column-oriented storage for a user's processed posts or comments
+"""
+
+from array import array
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+from utils.text_stats import TextStats
+from utils.text_utils import TextAnalysis
+
+SENTIMENT_FIELDS = (
+    'vader_compound', 'vader_positive', 'vader_negative', 'vader_neutral',
+    'textblob_polarity', 'textblob_subjectivity'
+)
+# Per-item TextStats counts, summed by text_stats()
+_STATS_COLUMNS = {
+    'word_count': 'words', 'sentence_count': 'sentences', 'question_count': 'questions',
+    'exclamation_count': 'exclamations', 'caps_count': 'caps'
+}
+NUMERIC_COLUMNS = ('created_utc', 'score', 'text_length') + SENTIMENT_FIELDS + tuple(_STATS_COLUMNS)
+
+_POST_FIELDS = ('clean_title', 'clean_text', 'total_text', 'text_length', 'sentiment',
+                'keywords', 'readability', 'timestamp', 'topic_hits')
+_COMMENT_FIELDS = ('clean_text', 'text_length', 'sentiment', 'keywords', 'readability',
+                   'timestamp', 'topic_hits')
+
+
+class ItemRow(NamedTuple):
+    """Everything listing analysis computes for one kept item (picklable, for pool workers)"""
+    clean_title: Optional[str]
+    clean_text: str
+    topic_hits: Dict[str, int]
+    sentiment: Dict
+    stats: TextStats
+
+
+class ItemStore(Sequence):
+    """
+    Processed posts or comments of one user, one column per field
+
+    Raw scraper records are referenced rather than copied; cleaned text, topic
+    hits and numbers live in per-field columns (numbers in compact arrays, so
+    aggregates are numpy operations via column()). Indexing yields ItemView
+    mappings that look like the per-item dicts processing used to build.
+    Keywords and readability are computed only when a view asks for them.
+    """
+
+    def __init__(self, kind: str):
+        """
+        Args:
+            kind: 'post' or 'comment'
+        """
+        self.kind = kind
+        self.fields = _POST_FIELDS if kind == 'post' else _COMMENT_FIELDS
+        self.records: List[Dict] = []
+        self.clean_title: List[str] = []
+        self.clean_text: List[str] = []
+        self.topic_hits: List[Dict[str, int]] = []
+        self._numeric = {name: array('d') for name in NUMERIC_COLUMNS}
+        self._text_features: Dict[int, Dict[str, Any]] = {}
+
+    def append(self, record: Dict, clean_text: str, clean_title: Optional[str] = None,
+               topic_hits: Optional[Dict[str, int]] = None, stats: Optional[TextStats] = None) -> int:
+        """Add one item (sentiment unset) and return its row index; `stats` are of text(index)"""
+        index = len(self.records)
+        self.records.append(record)
+        self.clean_text.append(clean_text)
+        if self.kind == 'post':
+            self.clean_title.append(clean_title or '')
+        self.topic_hits.append(topic_hits or {})
+
+        if stats is None:
+            stats = TextStats.of(self.text(index))
+        numeric = self._numeric
+        numeric['created_utc'].append(record.get('created_utc') or 0)
+        numeric['score'].append(record.get('score') or 0)
+        numeric['text_length'].append(stats.chars)
+        for field in SENTIMENT_FIELDS:
+            numeric[field].append(np.nan)
+        for column, field in _STATS_COLUMNS.items():
+            numeric[column].append(getattr(stats, field))
+        return index
+
+    def append_row(self, record: Dict, row: ItemRow) -> int:
+        """Add one analyzed item, sentiment included"""
+        index = self.append(record, row.clean_text, row.clean_title, row.topic_hits, row.stats)
+        self.set_sentiment(index, row.sentiment)
+        return index
+
+    def set_sentiment(self, index: int, sentiment: Dict):
+        for field in SENTIMENT_FIELDS:
+            self._numeric[field][index] = sentiment[field]
+
+    def text(self, index: int) -> str:
+        """The text features are computed from: title + body for posts, body for comments"""
+        if self.kind == 'post':
+            return f"{self.clean_title[index]} {self.clean_text[index]}"
+        return self.clean_text[index]
+
+    def texts(self) -> List[str]:
+        return [self.text(i) for i in range(len(self))]
+
+    def text_stats(self) -> TextStats:
+        """Corpus text counts for every item in the store"""
+        stats = TextStats(texts=len(self), chars=int(sum(self._numeric['text_length'])))
+        for column, field in _STATS_COLUMNS.items():
+            setattr(stats, field, int(sum(self._numeric[column])))
+        return stats
+
+    def column(self, name: str) -> np.ndarray:
+        """A numeric column as a float64 array (a copy, so the store can keep growing)"""
+        return np.array(self._numeric[name], dtype=np.float64)
+
+    def take(self, indexes: Iterable[int]) -> 'ItemStore':
+        """A new store with the given rows, in that order"""
+        taken = ItemStore(self.kind)
+        for row, index in enumerate(indexes):
+            taken.records.append(self.records[index])
+            taken.clean_text.append(self.clean_text[index])
+            if self.kind == 'post':
+                taken.clean_title.append(self.clean_title[index])
+            taken.topic_hits.append(self.topic_hits[index])
+            for name, column in self._numeric.items():
+                taken._numeric[name].append(column[index])
+            if index in self._text_features:
+                taken._text_features[row] = dict(self._text_features[index])
+        return taken
+
+    def text_feature(self, index: int, name: str):
+        """
+        'keywords' or 'readability' of one item, computed on first use
+
+        Readability is cached before keywords are extracted, so it stays
+        readable when the NLTK stopwords corpus keywords need is missing;
+        reading keywords first fills both from one tokenization.
+        """
+        features = self._text_features.setdefault(index, {})
+        if name not in features:
+            analysis = TextAnalysis(self.text(index))
+            features.setdefault('readability', analysis.readability)
+            if name == 'keywords':
+                features['keywords'] = analysis.keywords()
+        return features[name]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ItemView(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('item index out of range')
+        return ItemView(self, index)
+
+
+class ItemView(Mapping):
+    """Read-only dict-like view of one row: raw record fields plus processed ones"""
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: ItemStore, index: int):
+        self._store = store
+        self._index = index
+
+    def _processed(self, key):
+        store, i = self._store, self._index
+        if key == 'clean_title':
+            return store.clean_title[i]
+        if key == 'clean_text':
+            return store.clean_text[i]
+        if key == 'total_text':
+            return store.text(i)
+        if key == 'text_length':
+            return int(store._numeric['text_length'][i])
+        if key == 'sentiment':
+            if np.isnan(store._numeric['vader_compound'][i]):
+                return None
+            return {field: store._numeric[field][i] for field in SENTIMENT_FIELDS}
+        if key == 'topic_hits':
+            return store.topic_hits[i]
+        if key == 'timestamp':
+            return datetime.fromtimestamp(store.records[i].get('created_utc', 0))
+        return store.text_feature(i, key)
+
+    def __getitem__(self, key):
+        if key in self._store.fields:
+            return self._processed(key)
+        return self._store.records[self._index][key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._store.fields or key in self._store.records[self._index]
+
+    def __iter__(self):
+        record = self._store.records[self._index]
+        yield from (key for key in record if key not in self._store.fields)
+        yield from self._store.fields
+
+    def __len__(self) -> int:
+        record = self._store.records[self._index]
+        return len(self._store.fields) + sum(1 for key in record if key not in self._store.fields)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
@@ -0,0 +1,94 @@
+"""
+Listing Fetcher Module
+Pages Reddit user listings as raw JSON, skipping the PRAW object model
+"""
+
+import logging
+from typing import Dict, Iterator, Tuple
+
+LISTING_PAGE_SIZE = 100
+
+
+def decode_post(data: Dict) -> Dict:
+    """Build the scraper's post record from a raw t3 listing child"""
+    return {
+        'id': data['id'],
+        'title': data.get('title') or '',
+        'text': data.get('selftext') or '',
+        'score': data.get('score', 0),
+        'upvote_ratio': data.get('upvote_ratio', 0.5),
+        'subreddit': data.get('subreddit', ''),
+        'created_utc': data['created_utc'],
+        'num_comments': data.get('num_comments', 0),
+        'url': data.get('url', ''),
+        'permalink': f"https://reddit.com{data.get('permalink', '')}",
+        'type': 'post'
+    }
+
+
+def decode_comment(data: Dict) -> Dict:
+    """Build the scraper's comment record from a raw t1 listing child"""
+    return {
+        'id': data['id'],
+        'text': data.get('body') or '',
+        'score': data.get('score', 0),
+        'subreddit': data.get('subreddit', ''),
+        'created_utc': data['created_utc'],
+        'permalink': f"https://reddit.com{data.get('permalink', '')}",
+        'parent_id': data.get('parent_id', ''),
+        'type': 'comment'
+    }
+
+
+class JsonListingFetcher:
+    """Fetches /user/{name}/submitted and /comments pages with limit=100"""
+
+    LISTINGS = {
+        'submitted': decode_post,
+        'comments': decode_comment
+    }
+
+    def __init__(self, reddit):
+        """
+        Args:
+            reddit: Any client exposing PRAW's ``request(method=, path=, params=)``,
+                which returns parsed JSON without building model objects
+        """
+        self.logger = logging.getLogger(__name__)
+        self.reddit = reddit
+
+    def iter_listing(self, username: str, listing: str, limit: int) -> Iterator[Tuple[Dict, bool]]:
+        """
+        Yield (record, stickied) pairs newest first, one page request at a time
+
+        Pages are only requested as the caller consumes items, so breaking out
+        of the loop early never costs an extra request.
+        """
+        decode = self.LISTINGS[listing]
+        after = None
+        fetched = 0
+
+        while fetched < limit:
+            params = {'limit': min(LISTING_PAGE_SIZE, limit - fetched), 'sort': 'new'}
+            if after:
+                params['after'] = after
+
+            page = self.reddit.request(method='GET', path=f'/user/{username}/{listing}', params=params)
+            data = page.get('data', {}) if isinstance(page, dict) else {}
+            children = data.get('children', [])
+
+            for child in children:
+                item = child.get('data', {})
+                try:
+                    record = decode(item)
+                except (KeyError, TypeError) as e:
+                    self.logger.warning(f"Skipping malformed {listing} item {item.get('id')}: {e}")
+                    continue
+                fetched += 1
+                yield record, bool(item.get('stickied', False))
+                if fetched >= limit:
+                    return
+
+            after = data.get('after')
+            if not after or not children:
+                return
@@ -0,0 +1,82 @@
+"""
+Parallel NLP Module
+Shards large listings across a process pool for cleaning and scoring
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _init_worker():
+    """Load NLTK, VADER/TextBlob and the topic automaton once per worker process"""
+    from src.sentiment_engine import get_sentiment_engine
+    from utils.topic_matcher import get_topic_matcher
+
+    get_sentiment_engine()
+    get_topic_matcher()
+
+
+def get_process_pool():
+    """Return (pool, worker count) shared by every processor in this process"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None:
+            from config import PARALLEL_WORKERS
+
+            _pool_workers = PARALLEL_WORKERS or os.cpu_count() or 1
+            # spawn: forking a threaded server (gunicorn threads, scraper pools) is unsafe
+            _pool = ProcessPoolExecutor(
+                max_workers=_pool_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker
+            )
+        return _pool, _pool_workers
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def run_sharded(fn: Callable[[List], List], payload: List) -> List:
+    """
+    Apply a listing function to `payload`, in worker processes when it is large
+
+    `fn` must be a module-level function mapping a list to a list of the same
+    length. Below PARALLEL_MIN_ITEMS (or with PARALLEL_PROCESSING off) it runs
+    in-process; otherwise the payload is cut into one contiguous shard per
+    worker and the shard results are concatenated in order, so the output is
+    identical either way.
+    """
+    from config import PARALLEL_PROCESSING, PARALLEL_MIN_ITEMS
+
+    if not PARALLEL_PROCESSING or len(payload) < max(2, PARALLEL_MIN_ITEMS):
+        return fn(payload)
+
+    pool, workers = get_process_pool()
+    size = -(-len(payload) // workers)
+    shards = [payload[start:start + size] for start in range(0, len(payload), size)]
+
+    try:
+        results = []
+        for part in pool.map(fn, shards):
+            results.extend(part)
+        return results
+    except BrokenProcessPool as e:
+        logger.warning(f"Process pool failed ({e}); processing {len(payload)} items in-process")
+        _discard_pool(pool)
+        return fn(payload)
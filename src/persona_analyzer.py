@@ -3,24 +3,165 @@ Persona Analyzer Module
 Uses LLM to analyze user data and generate persona characteristics
 """
 
+import hashlib
 import json
 import logging
+import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 
 from groq import Groq
 
+from utils.disk_cache import DiskCache
+from utils.prompt_builder import compact, estimate_tokens, fit_lines, squeeze
 from config import (
     LLM_PROVIDER, GROQ_API_KEY, GOOGLE_API_KEY, 
-    GROQ_MODEL, GOOGLE_MODEL, CONFIDENCE_THRESHOLD
+    GROQ_MODEL, GOOGLE_MODEL, CONFIDENCE_THRESHOLD, LLM_MAX_CONCURRENCY, PERSONA_PROMPT_MODE,
+    PROMPT_TOKEN_BUDGET
 )
 
+# Persona key -> analyzer method; each is one independent LLM round trip
+PERSONA_SECTIONS = (
+    ('demographics', '_analyze_demographics'),
+    ('personality', '_analyze_personality'),
+    ('motivations', '_analyze_motivations'),
+    ('behaviors_habits', '_analyze_behaviors'),
+    ('frustrations', '_analyze_frustrations'),
+    ('goals_needs', '_analyze_goals'),
+)
+
+# What each section asks for, in the single-prompt mode
+_SECTION_TASKS = {
+    'demographics': "Infer demographic characteristics. Be conservative in your estimates and indicate confidence levels.",
+    'personality': "Determine personality traits using established frameworks (Big Five, Myers-Briggs indicators).",
+    'motivations': "Analyze what motivates this user based on their posting patterns and content.",
+    'behaviors_habits': "Analyze behavioral patterns and habits.",
+    'frustrations': "Identify potential frustrations and pain points.",
+    'goals_needs': "Identify the goals and needs of this user based on their activity.",
+}
+
+# Statistics the prompts use, by analysis_data entry
+_STYLE_FEATURES = ('question_ratio', 'exclamation_ratio', 'caps_ratio', 'avg_post_length', 'avg_comment_length')
+_ENGAGEMENT_FEATURES = ('avg_post_score', 'avg_comment_score', 'post_to_comment_ratio', 'avg_post_length',
+                        'avg_comment_length')
+_ACTIVITY_KEYS = ('posting_frequency', 'activity_consistency', 'posts_vs_comments', 'most_active_day',
+                  'most_active_hour', 'hour_distribution', 'top_subreddits')
+_TOPIC_KEYS = ('primary_interest', 'top_topics')
+
+# Placeholder for sample content, filled to fit PROMPT_TOKEN_BUDGET
+_SAMPLE_SLOT = '\x00samples\x00'
+
+# Example JSON each section's response must follow
+_SECTION_FORMATS = {
+    'demographics': """{
+            "age_range": "estimated age range (e.g., '25-35')",
+            "age_confidence": 0.5,
+            "likely_gender": "inferred gender or 'unknown'",
+            "gender_confidence": 0.3,
+            "likely_location": "inferred location or 'unknown'",
+            "location_confidence": 0.2,
+            "occupation_category": "inferred occupation category",
+            "occupation_confidence": 0.4,
+            "education_level": "inferred education level",
+            "education_confidence": 0.3,
+            "relationship_status": "inferred status or 'unknown'",
+            "status_confidence": 0.2
+        }""",
+    'personality': """{
+            "big_five": {
+                "openness": 0.7,
+                "conscientiousness": 0.6,
+                "extraversion": 0.5,
+                "agreeableness": 0.8,
+                "neuroticism": 0.4
+            },
+            "communication_style": "description of communication style",
+            "social_tendencies": "introverted/extraverted tendencies",
+            "decision_making": "thinking vs feeling preference",
+            "information_processing": "sensing vs intuition preference",
+            "lifestyle_approach": "judging vs perceiving preference",
+            "key_traits": ["analytical", "curious", "helpful", "detailed"],
+            "archetype": "The Analyst"
+        }""",
+    'motivations': """{
+            "primary_motivations": ["knowledge_sharing", "community_building", "entertainment"],
+            "convenience_importance": 0.6,
+            "social_connection": 0.8,
+            "knowledge_sharing": 0.9,
+            "entertainment": 0.7,
+            "self_expression": 0.5,
+            "community_belonging": 0.8,
+            "achievement_recognition": 0.4,
+            "motivational_quote": "Knowledge shared is knowledge multiplied"
+        }""",
+    'behaviors_habits': """{
+            "posting_habits": ["consistent_daily_posting", "prefers_comments_over_posts"],
+            "content_preferences": ["technical_discussions", "helpful_responses"],
+            "interaction_style": "helpful and analytical",
+            "time_patterns": "most active during evening hours",
+            "platform_usage": "primarily uses Reddit for learning and sharing knowledge",
+            "engagement_behavior": "responds thoughtfully to questions",
+            "routine_indicators": ["daily_check_ins", "weekend_longer_posts"]
+        }""",
+    'frustrations': """{
+            "main_frustrations": ["information_overload", "repetitive_questions"],
+            "technology_frustrations": ["slow_loading_times", "poor_search_functionality"],
+            "social_frustrations": ["toxic_comments", "lack_of_constructive_discussion"],
+            "platform_frustrations": ["unclear_moderation", "limited_formatting_options"],
+            "time_management_issues": ["spending_too_much_time_scrolling"],
+            "information_overload": true,
+            "engagement_disappointment": false
+        }""",
+    'goals_needs': """{
+            "primary_goals": ["learn_new_skills", "help_others", "stay_informed"],
+            "information_needs": ["technical_tutorials", "industry_news", "best_practices"],
+            "social_needs": ["expert_validation", "peer_discussion", "mentorship"],
+            "entertainment_needs": ["interesting_content", "humor", "community_events"],
+            "learning_objectives": ["skill_development", "career_advancement", "hobby_improvement"],
+            "community_goals": ["build_reputation", "contribute_knowledge", "network"],
+            "personal_development": ["critical_thinking", "communication_skills", "expertise"],
+            "long_term_aspirations": ["become_expert", "build_influence", "create_impact"]
+        }""",
+}
+
+SYSTEM_PROMPT = (
+    "You are an expert user experience researcher and psychologist specializing in digital behavior analysis. "
+    "Provide accurate, evidence-based insights. Always return valid JSON."
+)
+TEMPERATURE = 0.3
+
+# Shared by every analyzer in the process, so concurrent users together
+# stay within LLM_MAX_CONCURRENCY requests
+_llm_slots = threading.BoundedSemaphore(max(1, LLM_MAX_CONCURRENCY))
+
+_llm_cache: Optional[DiskCache] = None
+_llm_cache_ready = False
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[DiskCache]:
+    """Return the process-wide LLM response cache, or None when LLM_CACHE_TTL is 0"""
+    global _llm_cache, _llm_cache_ready
+    with _llm_cache_lock:
+        if not _llm_cache_ready:
+            from config import LLM_CACHE_DIR, LLM_CACHE_TTL, LLM_CACHE_MAX_MB
+            
+            _llm_cache_ready = True
+            if LLM_CACHE_TTL > 0:
+                try:
+                    _llm_cache = DiskCache(LLM_CACHE_DIR, LLM_CACHE_TTL, int(LLM_CACHE_MAX_MB * 1024 * 1024))
+                except OSError as e:
+                    logging.getLogger(__name__).warning(f"LLM cache disabled, directory unavailable: {e}")
+        return _llm_cache
+
 class PersonaAnalyzer:
     """Analyzes user data to generate persona using LLM"""
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.provider = LLM_PROVIDER
+        self.cache = get_llm_cache()
         self._initialize_llm()
     
     def _initialize_llm(self):
@@ -46,47 +187,147 @@ class PersonaAnalyzer:
             self.logger.error(f"Failed to initialize LLM: {str(e)}")
             raise
     
-    def analyze_persona(self, processed_data: Dict) -> Dict:
+    def analyze_persona(self, processed_data: Dict, mode: Optional[str] = None) -> Dict:
         """
         Analyze processed user data to generate persona
         
         Args:
             processed_data: Processed user data from DataProcessor
+            mode: 'sections' (one prompt per section) or 'single' (one prompt
+                for all sections); defaults to PERSONA_PROMPT_MODE
             
         Returns:
-            Dictionary containing persona characteristics
+            Dictionary containing persona characteristics, plus 'llm_cache'
+            with the process-wide response cache totals (see cache_stats)
         """
         try:
             # Prepare data for analysis
             analysis_data = self._prepare_analysis_data(processed_data)
             
             # Generate different aspects of persona
-            demographics = self._analyze_demographics(analysis_data)
-            personality = self._analyze_personality(analysis_data)
-            motivations = self._analyze_motivations(analysis_data)
-            behaviors = self._analyze_behaviors(analysis_data)
-            frustrations = self._analyze_frustrations(analysis_data)
-            goals = self._analyze_goals(analysis_data)
+            if (mode or PERSONA_PROMPT_MODE) == 'single':
+                sections = self._analyze_combined(analysis_data)
+            else:
+                sections = self._analyze_sections(analysis_data)
             
             # Combine all aspects
             persona = {
                 'username': processed_data.get('username'),
-                'demographics': demographics,
-                'personality': personality,
-                'motivations': motivations,
-                'behaviors_habits': behaviors,
-                'frustrations': frustrations,
-                'goals_needs': goals,
+                **sections,
                 'confidence_score': self._calculate_confidence_score(analysis_data),
-                'analysis_summary': self._generate_summary(analysis_data)
+                'analysis_summary': self._generate_summary(analysis_data),
+                'llm_cache': self.cache_stats()
             }
             
+            if self.cache:
+                stats = persona['llm_cache']
+                self.logger.info(
+                    f"LLM cache totals: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions"
+                )
+            
             return persona
             
         except Exception as e:
             self.logger.error(f"Error analyzing persona: {str(e)}")
             raise
     
+    def cache_stats(self) -> Dict:
+        """LLM response cache hits, misses and evictions since the process started"""
+        if not self.cache:
+            return {'enabled': False, 'hits': 0, 'misses': 0, 'evictions': 0}
+        return {'enabled': True, **self.cache.stats()}
+    
+    def _analyze_sections(self, data: Dict, keys: Optional[List[str]] = None) -> Dict:
+        """
+        Run the persona section analyzers (all, or just `keys`) concurrently
+        
+        A section that fails gets an error entry instead of failing the whole
+        persona; only if every requested section fails is the first error raised.
+        """
+        methods = [(key, method) for key, method in PERSONA_SECTIONS if keys is None or key in keys]
+        workers = max(1, min(LLM_MAX_CONCURRENCY, len(methods)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='llm') as pool:
+            futures = {key: pool.submit(getattr(self, method), data) for key, method in methods}
+        
+        sections, errors = {}, []
+        for key, future in futures.items():
+            try:
+                sections[key] = future.result()
+            except Exception as e:
+                self.logger.warning(f"Persona section '{key}' failed: {str(e)}")
+                sections[key] = {"error": f"Section analysis failed: {str(e)}"}
+                errors.append(e)
+        
+        if errors and len(errors) == len(methods):
+            raise errors[0]
+        return sections
+    
+    def _analyze_combined(self, data: Dict) -> Dict:
+        """
+        Request every section in one JSON response, sending the user context once
+        
+        Sections missing from the response or not parseable are re-requested
+        with their own prompts.
+        """
+        parsed = {}
+        try:
+            response = self._query_llm(self._combined_prompt(data), max_tokens=1000 * len(PERSONA_SECTIONS), json_mode=True)
+            try:
+                parsed = json.loads(response)
+            except json.JSONDecodeError:
+                parsed = self._extract_json_from_response(response)
+        except Exception as e:
+            self.logger.warning(f"Combined persona request failed: {str(e)}")
+        
+        sections = {
+            key: parsed[key] for key, _ in PERSONA_SECTIONS
+            if isinstance(parsed.get(key), dict) and parsed[key] and 'error' not in parsed[key]
+        }
+        missing = [key for key, _ in PERSONA_SECTIONS if key not in sections]
+        if missing:
+            self.logger.info(f"Re-requesting persona sections individually: {', '.join(missing)}")
+            try:
+                sections.update(self._analyze_sections(data, missing))
+            except Exception as e:
+                if not sections:
+                    raise
+                sections.update({key: {"error": f"Section analysis failed: {str(e)}"} for key in missing})
+        
+        return {key: sections[key] for key, _ in PERSONA_SECTIONS}
+    
+    def _combined_prompt(self, data: Dict) -> str:
+        """The statistics and samples every section prompt uses, followed by all section formats"""
+        section_specs = '\n'.join(
+            f"""
+        "{key}": {_SECTION_TASKS[key]}
+        {_SECTION_FORMATS[key]}"""
+            for key, _ in PERSONA_SECTIONS
+        )
+        
+        prompt = f"""
+        Analyze the following Reddit user data and build a complete user persona.
+        
+        User Summary:
+        - Account age: {compact(data['summary']['account_age_days'], digits=0)} days
+        - Total posts: {data['summary']['total_posts']}
+        - Total comments: {data['summary']['total_comments']}
+        - Average sentiment: {compact(data['summary']['avg_sentiment'])}
+        
+        User Data:
+        - Writing style and engagement: {compact(data['features'], _STYLE_FEATURES + _ENGAGEMENT_FEATURES[:3])}
+        - Sentiment patterns: {compact(data['sentiment_patterns'])}
+        - Activity patterns: {compact(data['activity_patterns'], _ACTIVITY_KEYS)}
+        - Topics of interest: {compact(data['topics'], _TOPIC_KEYS)}
+        - Distinctive vocabulary: {', '.join(data['keywords'][:15])}
+        
+        Sample content:
+        {_SAMPLE_SLOT}
+        
+        Respond with one JSON object with exactly these keys, each value following its format:
+        {section_specs}
+        """
+        return self._fill_samples(prompt, data['sample_posts'][:3], data['sample_comments'][:5], section_specs)
+    
     def _prepare_analysis_data(self, processed_data: Dict) -> Dict:
         """Prepare data for LLM analysis"""
         
@@ -94,6 +335,7 @@ class PersonaAnalyzer:
         features = processed_data.get('features', {})
         sentiment = processed_data.get('sentiment_patterns', {})
         topics = processed_data.get('topics', {})
+        keyword_profile = processed_data.get('keyword_profile', [])
         activity = processed_data.get('activity_patterns', {})
         user_info = processed_data.get('user_info', {})
         
@@ -117,6 +359,7 @@ class PersonaAnalyzer:
             'features': features,
             'sentiment_patterns': sentiment,
             'topics': topics,
+            'keywords': [entry['term'] for entry in keyword_profile],
             'activity_patterns': activity,
             'user_info': user_info,
             'sample_posts': posts,
@@ -132,33 +375,21 @@ class PersonaAnalyzer:
         Be conservative in your estimates and indicate confidence levels.
         
         User Summary:
-        - Account age: {data['summary']['account_age_days']} days
+        - Account age: {compact(data['summary']['account_age_days'], digits=0)} days
         - Total posts: {data['summary']['total_posts']}
         - Total comments: {data['summary']['total_comments']}
         - Primary topics: {data['topics'].get('primary_interest', 'general')}
         - Top subreddits: {[sub[0] for sub in data['summary']['top_subreddits']]}
-        - Average sentiment: {data['summary']['avg_sentiment']}
+        - Average sentiment: {compact(data['summary']['avg_sentiment'])}
         
         Sample content:
-        {self._format_sample_content(data['sample_posts'][:3], data['sample_comments'][:5])}
+        {_SAMPLE_SLOT}
         
         Provide demographic analysis in JSON format:
-        {{
-            "age_range": "estimated age range (e.g., '25-35')",
-            "age_confidence": 0.5,
-            "likely_gender": "inferred gender or 'unknown'",
-            "gender_confidence": 0.3,
-            "likely_location": "inferred location or 'unknown'",
-            "location_confidence": 0.2,
-            "occupation_category": "inferred occupation category",
-            "occupation_confidence": 0.4,
-            "education_level": "inferred education level",
-            "education_confidence": 0.3,
-            "relationship_status": "inferred status or 'unknown'",
-            "status_confidence": 0.2
-        }}
+        {_SECTION_FORMATS['demographics']}
         """
         
+        prompt = self._fill_samples(prompt, data['sample_posts'][:3], data['sample_comments'][:5], _SECTION_FORMATS['demographics'])
         response = self._query_llm(prompt)
         try:
             return json.loads(response)
@@ -173,33 +404,20 @@ class PersonaAnalyzer:
         Use established personality frameworks (Big Five, Myers-Briggs indicators).
         
         User Data:
-        - Writing style: {data['features']}
-        - Sentiment patterns: {data['sentiment_patterns']}
-        - Activity patterns: {data['activity_patterns']}
-        - Topics of interest: {data['topics']}
+        - Writing style: {compact(data['features'], _STYLE_FEATURES)}
+        - Sentiment patterns: {compact(data['sentiment_patterns'])}
+        - Activity patterns: {compact(data['activity_patterns'], _ACTIVITY_KEYS)}
+        - Topics of interest: {compact(data['topics'], _TOPIC_KEYS)}
+        - Distinctive vocabulary: {', '.join(data['keywords'][:15])}
         
         Sample content:
-        {self._format_sample_content(data['sample_posts'][:3], data['sample_comments'][:5])}
+        {_SAMPLE_SLOT}
         
         Provide personality analysis in JSON format:
-        {{
-            "big_five": {{
-                "openness": 0.7,
-                "conscientiousness": 0.6,
-                "extraversion": 0.5,
-                "agreeableness": 0.8,
-                "neuroticism": 0.4
-            }},
-            "communication_style": "description of communication style",
-            "social_tendencies": "introverted/extraverted tendencies",
-            "decision_making": "thinking vs feeling preference",
-            "information_processing": "sensing vs intuition preference",
-            "lifestyle_approach": "judging vs perceiving preference",
-            "key_traits": ["analytical", "curious", "helpful", "detailed"],
-            "archetype": "The Analyst"
-        }}
+        {_SECTION_FORMATS['personality']}
         """
         
+        prompt = self._fill_samples(prompt, data['sample_posts'][:3], data['sample_comments'][:5], _SECTION_FORMATS['personality'])
         response = self._query_llm(prompt)
         try:
             return json.loads(response)
@@ -213,27 +431,19 @@ class PersonaAnalyzer:
         Analyze what motivates this Reddit user based on their posting patterns and content.
         
         User Data:
-        - Topics: {data['topics']}
-        - Activity patterns: {data['activity_patterns']}
-        - Engagement metrics: {data['features']}
+        - Topics: {compact(data['topics'], _TOPIC_KEYS)}
+        - Distinctive vocabulary: {', '.join(data['keywords'][:15])}
+        - Activity patterns: {compact(data['activity_patterns'], _ACTIVITY_KEYS[:3] + _ACTIVITY_KEYS[-1:])}
+        - Engagement metrics: {compact(data['features'], _ENGAGEMENT_FEATURES)}
         
         Sample content:
-        {self._format_sample_content(data['sample_posts'][:3], data['sample_comments'][:5])}
+        {_SAMPLE_SLOT}
         
         Provide motivations analysis in JSON format:
-        {{
-            "primary_motivations": ["knowledge_sharing", "community_building", "entertainment"],
-            "convenience_importance": 0.6,
-            "social_connection": 0.8,
-            "knowledge_sharing": 0.9,
-            "entertainment": 0.7,
-            "self_expression": 0.5,
-            "community_belonging": 0.8,
-            "achievement_recognition": 0.4,
-            "motivational_quote": "Knowledge shared is knowledge multiplied"
-        }}
+        {_SECTION_FORMATS['motivations']}
         """
         
+        prompt = self._fill_samples(prompt, data['sample_posts'][:3], data['sample_comments'][:5], _SECTION_FORMATS['motivations'])
         response = self._query_llm(prompt)
         try:
             return json.loads(response)
@@ -247,26 +457,18 @@ class PersonaAnalyzer:
         Analyze behavioral patterns and habits of this Reddit user.
         
         Activity Data:
-        - Posting frequency: {data['activity_patterns'].get('posting_frequency', 0)}
+        - Posting frequency: {compact(data['activity_patterns'].get('posting_frequency', 0))}
         - Most active time: {data['activity_patterns'].get('most_active_hour', 0)}:00
-        - Post vs comment ratio: {data['activity_patterns'].get('posts_vs_comments', 0)}
-        - Top subreddits: {data['activity_patterns'].get('top_subreddits', [])[:5]}
+        - Post vs comment ratio: {compact(data['activity_patterns'].get('posts_vs_comments', 0))}
+        - Top subreddits: {compact(data['activity_patterns'].get('top_subreddits', [])[:5])}
         
         Content Analysis:
-        - Average post length: {data['features'].get('avg_post_length', 0)}
-        - Question ratio: {data['features'].get('question_ratio', 0)}
-        - Exclamation ratio: {data['features'].get('exclamation_ratio', 0)}
+        - Average post length: {compact(data['features'].get('avg_post_length', 0), digits=0)}
+        - Question ratio: {compact(data['features'].get('question_ratio', 0))}
+        - Exclamation ratio: {compact(data['features'].get('exclamation_ratio', 0))}
         
         Provide behavioral analysis in JSON format:
-        {{
-            "posting_habits": ["consistent_daily_posting", "prefers_comments_over_posts"],
-            "content_preferences": ["technical_discussions", "helpful_responses"],
-            "interaction_style": "helpful and analytical",
-            "time_patterns": "most active during evening hours",
-            "platform_usage": "primarily uses Reddit for learning and sharing knowledge",
-            "engagement_behavior": "responds thoughtfully to questions",
-            "routine_indicators": ["daily_check_ins", "weekend_longer_posts"]
-        }}
+        {_SECTION_FORMATS['behaviors_habits']}
         """
         
         response = self._query_llm(prompt)
@@ -282,28 +484,21 @@ class PersonaAnalyzer:
         Identify potential frustrations and pain points for this Reddit user.
         
         Sentiment Data:
-        - Overall sentiment: {data['sentiment_patterns'].get('overall_sentiment', {})}
-        - Negative posts ratio: {data['sentiment_patterns'].get('overall_sentiment', {}).get('posts_negative', 0)}
+        - Overall sentiment: {compact(data['sentiment_patterns'].get('overall_sentiment', {}))}
+        - Negative posts ratio: {compact(data['sentiment_patterns'].get('overall_sentiment', {}).get('posts_negative', 0))}
         
         Activity Data:
-        - Average scores: Posts {data['features'].get('avg_post_score', 0)}, Comments {data['features'].get('avg_comment_score', 0)}
+        - Average scores: Posts {compact(data['features'].get('avg_post_score', 0))}, Comments {compact(data['features'].get('avg_comment_score', 0))}
         - Subreddit diversity: {len(data['activity_patterns'].get('top_subreddits', []))}
         
         Sample content with negative sentiment:
-        {self._format_sample_content(data['sample_posts'][:2], data['sample_comments'][:3])}
+        {_SAMPLE_SLOT}
         
         Provide frustrations analysis in JSON format:
-        {{
-            "main_frustrations": ["information_overload", "repetitive_questions"],
-            "technology_frustrations": ["slow_loading_times", "poor_search_functionality"],
-            "social_frustrations": ["toxic_comments", "lack_of_constructive_discussion"],
-            "platform_frustrations": ["unclear_moderation", "limited_formatting_options"],
-            "time_management_issues": ["spending_too_much_time_scrolling"],
-            "information_overload": true,
-            "engagement_disappointment": false
-        }}
+        {_SECTION_FORMATS['frustrations']}
         """
         
+        prompt = self._fill_samples(prompt, data['sample_posts'][:2], data['sample_comments'][:3], _SECTION_FORMATS['frustrations'])
         response = self._query_llm(prompt)
         try:
             return json.loads(response)
@@ -318,24 +513,16 @@ class PersonaAnalyzer:
         
         User Activity:
         - Primary interests: {data['topics'].get('primary_interest', 'general')}
-        - Engagement level: {data['features'].get('avg_post_score', 0) + data['features'].get('avg_comment_score', 0)}
+        - Distinctive vocabulary: {', '.join(data['keywords'][:15])}
+        - Engagement level: {compact(data['features'].get('avg_post_score', 0) + data['features'].get('avg_comment_score', 0))}
         - Community involvement: {len(data['activity_patterns'].get('top_subreddits', []))}
         
         Content Analysis:
-        - Question asking behavior: {data['features'].get('question_ratio', 0)}
-        - Knowledge sharing: {data['features'].get('avg_post_length', 0)}
+        - Question asking behavior: {compact(data['features'].get('question_ratio', 0))}
+        - Knowledge sharing: {compact(data['features'].get('avg_post_length', 0), digits=0)}
         
         Provide goals analysis in JSON format:
-        {{
-            "primary_goals": ["learn_new_skills", "help_others", "stay_informed"],
-            "information_needs": ["technical_tutorials", "industry_news", "best_practices"],
-            "social_needs": ["expert_validation", "peer_discussion", "mentorship"],
-            "entertainment_needs": ["interesting_content", "humor", "community_events"],
-            "learning_objectives": ["skill_development", "career_advancement", "hobby_improvement"],
-            "community_goals": ["build_reputation", "contribute_knowledge", "network"],
-            "personal_development": ["critical_thinking", "communication_skills", "expertise"],
-            "long_term_aspirations": ["become_expert", "build_influence", "create_impact"]
-        }}
+        {_SECTION_FORMATS['goals_needs']}
         """
         
         response = self._query_llm(prompt)
@@ -344,8 +531,8 @@ class PersonaAnalyzer:
         except json.JSONDecodeError:
             return self._extract_json_from_response(response)
     
-    def _format_sample_content(self, posts: List[Dict], comments: List[Dict]) -> str:
-        """Format sample content for LLM analysis"""
+    def _format_sample_content(self, posts: List[Dict], comments: List[Dict]) -> List[str]:
+        """Format sample content for LLM analysis, one line per item"""
         content = []
         
         for post in posts[:3]:
@@ -354,30 +541,86 @@ class PersonaAnalyzer:
         for comment in comments[:3]:
             content.append(f"COMMENT: {comment.get('clean_text', '')[:200]}...")
         
-        return '\n'.join(content)
+        return content
     
-    def _query_llm(self, prompt: str) -> str:
-        """Query the LLM with the given prompt"""
+    def _fill_samples(self, prompt: str, posts: List[Dict], comments: List[Dict], response_format: str) -> str:
+        """
+        Put as much sample content in the prompt's sample slot as PROMPT_TOKEN_BUDGET allows
+        
+        The budget covers the prompt minus its response format, so every
+        section gets the same room for user context.
+        """
+        used = estimate_tokens(squeeze(prompt.replace(_SAMPLE_SLOT, ''))) - estimate_tokens(squeeze(response_format))
+        samples = fit_lines(self._format_sample_content(posts, comments), PROMPT_TOKEN_BUDGET - used)
+        return prompt.replace(_SAMPLE_SLOT, '\n'.join(samples))
+    
+    def _query_llm(self, prompt: str, max_tokens: int = 1000, json_mode: bool = False) -> str:
+        """
+        Query the LLM with the given prompt
+        
+        Responses that contain JSON are cached under a hash of everything that
+        determines them, so reruns on unchanged data make no LLM calls.
+        """
+        prompt = squeeze(prompt)
+        self.logger.debug(f"LLM request: ~{estimate_tokens(prompt)} prompt tokens")
+        key = self._cache_key(prompt, max_tokens, json_mode)
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
         try:
-            if self.provider == 'groq':
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are an expert user experience researcher and psychologist specializing in digital behavior analysis. Provide accurate, evidence-based insights. Always return valid JSON."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=1000,
-                    temperature=0.3
-                )
-                return response.choices[0].message.content
-            
-            elif self.provider == 'google':
-                response = self.client.generate_content(prompt)
-                return response.text
-            
+            with _llm_slots:
+                response = self._request(prompt, max_tokens, json_mode)
         except Exception as e:
             self.logger.error(f"Error querying LLM: {str(e)}")
             raise
+        
+        if self.cache and self._contains_json(response):
+            self.cache.set(key, response)
+        return response
+    
+    def _cache_key(self, prompt: str, max_tokens: int, json_mode: bool) -> str:
+        system = SYSTEM_PROMPT if self.provider == 'groq' else None
+        payload = json.dumps([self.provider, self.model, system, prompt, TEMPERATURE, max_tokens, json_mode])
+        return 'llm:' + hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _contains_json(response: Optional[str]) -> bool:
+        """Whether the response parses, directly or as its outermost {...}"""
+        if not response:
+            return False
+        start, end = response.find('{'), response.rfind('}') + 1
+        for candidate in (response, response[start:end] if start != -1 and end else None):
+            if candidate is None:
+                continue
+            try:
+                json.loads(candidate)
+                return True
+            except json.JSONDecodeError:
+                pass
+        return False
+    
+    def _request(self, prompt: str, max_tokens: int = 1000, json_mode: bool = False) -> str:
+        """One blocking round trip to the configured provider"""
+        if self.provider == 'groq':
+            # JSON mode constrains the reply to a single JSON object
+            extra = {'response_format': {'type': 'json_object'}} if json_mode else {}
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=max_tokens,
+                temperature=TEMPERATURE,
+                **extra
+            )
+            return response.choices[0].message.content
+        
+        elif self.provider == 'google':
+            response = self.client.generate_content(prompt)
+            return response.text
     
     def _extract_json_from_response(self, response: str) -> Dict:
         """Extract JSON from LLM response if direct parsing fails"""
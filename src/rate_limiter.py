@@ -0,0 +1,141 @@
+"""
+Rate Limiter Module
+Process-wide token bucket that charges one token per Reddit HTTP request
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Mapping, Optional
+
+import prawcore
+
+
+class TokenBucketRateLimiter:
+    """Thread-safe token bucket that adapts to Reddit's X-Ratelimit headers.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``, so
+    the first requests go out without sleeping. Once Reddit reports its own
+    budget via ``X-Ratelimit-Remaining`` / ``X-Ratelimit-Reset``, the server's
+    numbers win: we never spend more than the reported remaining requests before
+    the window resets, and we only sleep when that budget is actually exhausted.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be > 0 and capacity must be >= 1")
+
+        self.logger = logging.getLogger(__name__)
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(capacity)
+        self._updated = clock()
+
+        # Server-reported window; None until the first response with headers
+        self._remaining: Optional[float] = None
+        self._reset_at: Optional[float] = None
+
+        self.total_requests = 0
+        self.total_wait = 0.0
+
+    def acquire(self) -> float:
+        """Block until one request may be sent; return seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                delay = self._delay_needed(now)
+                if delay <= 0:
+                    if self._remaining is not None:
+                        self._remaining -= 1
+                    else:
+                        self._tokens -= 1
+                    self.total_requests += 1
+                    self.total_wait += waited
+                    return waited
+
+            self.logger.debug(f"Rate limit reached, sleeping {delay:.2f}s")
+            self._sleep(delay)
+            waited += delay
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """Sync the bucket with Reddit's X-Ratelimit-Remaining/Reset headers."""
+        remaining = headers.get('x-ratelimit-remaining')
+        reset = headers.get('x-ratelimit-reset')
+        if remaining is None or reset is None:
+            return
+
+        try:
+            remaining = float(remaining)
+            reset = float(reset)
+        except (TypeError, ValueError):
+            return
+
+        with self._lock:
+            self._remaining = remaining
+            self._reset_at = self._clock() + reset
+
+    def _refill(self, now: float):
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+        if self._reset_at is not None and now >= self._reset_at:
+            # Window rolled over; fall back to the local bucket until the next response
+            self._remaining = None
+            self._reset_at = None
+
+    def _delay_needed(self, now: float) -> float:
+        if self._remaining is not None:
+            # Reddit's own window is authoritative once we have seen it
+            return 0.0 if self._remaining >= 1 else max(0.0, self._reset_at - now)
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+
+_shared_limiter: Optional[TokenBucketRateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> TokenBucketRateLimiter:
+    """Return the limiter shared by every scraper in this process"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            from config import REDDIT_REQUESTS_PER_MINUTE, REDDIT_RATE_BURST
+
+            _shared_limiter = TokenBucketRateLimiter(
+                rate=REDDIT_REQUESTS_PER_MINUTE / 60.0,
+                capacity=REDDIT_RATE_BURST,
+            )
+        return _shared_limiter
+
+
+class RateLimitedRequestor(prawcore.Requestor):
+    """PRAW requestor that charges the shared limiter once per API request"""
+
+    def request(self, *args, **kwargs):
+        url = kwargs.get('url', args[1] if len(args) > 1 else '')
+        limiter = get_rate_limiter()
+
+        # Token fetches go to www.reddit.com and do not count against the API budget
+        charged = str(url).startswith(self.oauth_url)
+        if charged:
+            limiter.acquire()
+
+        response = super().request(*args, **kwargs)
+
+        if charged:
+            limiter.update_from_headers(response.headers)
+        return response
@@ -1,80 +1,222 @@
 
 import praw
-import time
+import prawcore
 import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.adaptive_depth import ConvergenceMonitor
+from src.listing_fetcher import LISTING_PAGE_SIZE, JsonListingFetcher
+from src.rate_limiter import RateLimitedRequestor
+from src.replay_backend import ReplayReddit
+from src.scrape_store import ScrapeStore, merge_items
+from utils.disk_cache import DiskCache
+
+class ScrapeCancelled(Exception):
+    """Raised from an on_item callback to abandon a scrape that is no longer wanted"""
+
+
+_thread_clients = threading.local()
+
+
+def get_reddit_client() -> praw.Reddit:
+    """
+    Return this thread's Reddit client
+    
+    PRAW does not document praw.Reddit as thread-safe, so every thread (server
+    request threads, stream and scrape workers) gets its own client, HTTP
+    session and OAuth token. All of them charge the process-wide rate limiter,
+    and the token is fetched lazily on the first API request, so creating
+    scrapers is free.
+    """
+    client = getattr(_thread_clients, 'reddit', None)
+    if client is None:
+        from config import REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, REDDIT_USER_AGENT
+        
+        client = praw.Reddit(
+            client_id=REDDIT_CLIENT_ID,
+            client_secret=REDDIT_CLIENT_SECRET,
+            user_agent=REDDIT_USER_AGENT,
+            read_only=True,
+            requestor_class=RateLimitedRequestor
+        )
+        _thread_clients.reddit = client
+        logging.getLogger(__name__).info(f"Reddit API client created for thread {threading.current_thread().name}")
+    return client
+
 
 class RedditScraper:
     """Handles Reddit data scraping using PRAW"""
     
-    def __init__(self):
+    def __init__(self, reddit: Optional[praw.Reddit] = None, backend: Optional[str] = None):
         self.logger = logging.getLogger(__name__)
-        self.reddit = self._initialize_reddit()
+        self.backend = self._resolve_backend(backend)
+        self._reddit = reddit or self._initialize_reddit()
+        self.store = self._initialize_store()
+        self.cache = self._initialize_cache()
     
-    def _initialize_reddit(self) -> praw.Reddit:
-        """Initialize Reddit API client"""
+    @property
+    def reddit(self) -> praw.Reddit:
+        """The injected or replay client, else the live client of the calling thread"""
+        return self._reddit or get_reddit_client()
+    
+    def _initialize_reddit(self) -> Optional[praw.Reddit]:
+        """
+        Initialize the Reddit API client
+        
+        Returns the replay client, which is safe to share between threads, or
+        None for live backends, whose clients are resolved per thread by the
+        reddit property. The calling thread's live client is still created here
+        so bad configuration fails at construction.
+        """
         try:
-            from config import REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, REDDIT_USER_AGENT
-            
-            reddit = praw.Reddit(
-                client_id=REDDIT_CLIENT_ID,
-                client_secret=REDDIT_CLIENT_SECRET,
-                user_agent=REDDIT_USER_AGENT,
-                read_only=True
-            )
-            
-            # Test the connection with a simple request
-            try:
-                list(reddit.subreddit('test').hot(limit=1))
-                self.logger.info("Reddit API initialized successfully")
-            except Exception as e:
-                self.logger.warning(f"Reddit API test failed: {e}")
-            
-            return reddit
-            
+            if self.backend == 'replay':
+                from config import (REPLAY_FIXTURES_DIR, REPLAY_JITTER_MS, REPLAY_LATENCY_MS,
+                                    REPLAY_RATE_LIMIT, REPLAY_RATE_WINDOW)
+                
+                return ReplayReddit(
+                    REPLAY_FIXTURES_DIR,
+                    latency=REPLAY_LATENCY_MS / 1000,
+                    jitter=REPLAY_JITTER_MS / 1000,
+                    rate_limit=REPLAY_RATE_LIMIT,
+                    rate_window=REPLAY_RATE_WINDOW
+                )
+            get_reddit_client()
+            return None
         except Exception as e:
             self.logger.error(f"Failed to initialize Reddit API: {str(e)}")
             raise
     
-    def scrape_user_data(self, username: str) -> Dict:
+    def _resolve_backend(self, backend: Optional[str]) -> str:
+        """Pick the listing backend: 'praw' objects, lightweight 'json' pages or offline 'replay'"""
+        from config import SCRAPE_BACKEND
+        
+        backend = (backend or SCRAPE_BACKEND).strip().lower()
+        if backend not in ('praw', 'json', 'replay'):
+            raise ValueError(f"Unsupported SCRAPE_BACKEND: {backend!r} (use 'praw', 'json' or 'replay')")
+        return backend
+    
+    def check_ready(self) -> bool:
+        """
+        Verify Reddit credentials by obtaining (or reusing) an OAuth token
+        
+        Uses the token endpoint only, so it costs no API rate budget.
+        """
+        try:
+            self.reddit.auth.scopes()
+            return True
+        except Exception as e:
+            self.logger.warning(f"Reddit readiness check failed: {e}")
+            return False
+    
+    def _initialize_store(self) -> Optional[ScrapeStore]:
+        """Open the incremental scrape store when enabled"""
+        from config import INCREMENTAL_SCRAPE, SCRAPE_STORE_DIR
+        
+        if not INCREMENTAL_SCRAPE:
+            return None
+        try:
+            return ScrapeStore(SCRAPE_STORE_DIR)
+        except OSError as e:
+            self.logger.warning(f"Incremental scraping disabled, store unavailable: {e}")
+            return None
+    
+    def _initialize_cache(self) -> Optional[DiskCache]:
+        """Open the raw corpus cache when a TTL is configured"""
+        from config import CORPUS_CACHE_DIR, CORPUS_CACHE_TTL, CORPUS_CACHE_MAX_MB
+        
+        if CORPUS_CACHE_TTL <= 0:
+            return None
+        try:
+            return DiskCache(CORPUS_CACHE_DIR, CORPUS_CACHE_TTL, int(CORPUS_CACHE_MAX_MB * 1024 * 1024))
+        except OSError as e:
+            self.logger.warning(f"Corpus cache disabled, directory unavailable: {e}")
+            return None
+    
+    def scrape_user_data(self, username: str, concurrent: Optional[bool] = None,
+                         use_cache: bool = True,
+                         on_item: Optional[Callable[[Dict], None]] = None) -> Dict:
         """
         Scrape posts and comments from a Reddit user
         
         Args:
             username: Reddit username (without u/ prefix)
+            concurrent: Fetch posts and comments in parallel
+                (defaults to SCRAPE_CONCURRENT)
+            use_cache: Serve a fresh enough cached corpus without calling Reddit
+            on_item: Called with each post/comment record as soon as it is
+                available (may be called from scrape worker threads); raising
+                ScrapeCancelled from it stops the scrape without saving anything
             
         Returns:
             Dictionary containing user data
         """
+        cache_key = f"corpus:{username.lower()}"
+        if use_cache and self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.logger.info(f"Using cached corpus for {username} (scraped at {cached.get('scraped_at')})")
+                if on_item:
+                    for item in cached['posts'] + cached['comments']:
+                        on_item(item)
+                return cached
+        
         try:
-            user = self.reddit.redditor(username)
-            
-            # Check if user exists by trying to access name
-            try:
-                _ = user.name
-                if user.name != username:
-                    raise ValueError(f"User {username} not found")
-            except Exception:
-                raise ValueError(f"User {username} not found or suspended")
+            # One about.json request both proves the account exists and fills user_info,
+            # so bad usernames fail here before any listing is paged
+            user_info = self._get_user_info(username)
+            name = user_info['name']
             
             self.logger.info(f"Scraping data for user: {username}")
             
-            # Get user info first
-            user_info = self._get_user_info(user)
+            from config import MAX_POSTS, MAX_COMMENTS, SCRAPE_CONCURRENT
             
-            # Scrape posts
-            posts = self._scrape_posts(user)
-            self.logger.info(f"Scraped {len(posts)} posts")
+            if concurrent is None:
+                concurrent = SCRAPE_CONCURRENT
+            
+            # Page only until we reach items we already have on disk
+            post_kwargs = {'on_item': on_item}
+            comment_kwargs = {'on_item': on_item}
+            if self.store:
+                stored = self.store.load(username)
+                post_kwargs.update(known_ids=stored['post_ids'], since_utc=stored['newest_post_utc'])
+                comment_kwargs.update(known_ids=stored['comment_ids'], since_utc=stored['newest_comment_utc'])
             
-            # Scrape comments
-            comments = self._scrape_comments(user)
+            if concurrent:
+                # Independent endpoints; the shared rate limiter keeps the combined budget legal.
+                # Each worker is a fresh thread with its own client, so each fetches a token first
+                with ThreadPoolExecutor(max_workers=2, thread_name_prefix='scrape') as pool:
+                    posts_future = pool.submit(self._scrape_posts, name, **post_kwargs)
+                    comments_future = pool.submit(self._scrape_comments, name, **comment_kwargs)
+                    posts = posts_future.result()
+                    comments = comments_future.result()
+            else:
+                posts = self._scrape_posts(name, **post_kwargs)
+                comments = self._scrape_comments(name, **comment_kwargs)
+            
+            self.logger.info(f"Scraped {len(posts)} posts")
             self.logger.info(f"Scraped {len(comments)} comments")
             
+            if self.store:
+                fresh_ids = {item['id'] for item in posts + comments}
+                posts = merge_items(posts, stored['posts'], MAX_POSTS)
+                comments = merge_items(comments, stored['comments'], MAX_COMMENTS)
+                self.logger.info(f"Merged with stored corpus: {len(posts)} posts, {len(comments)} comments")
+                if on_item:
+                    for item in posts + comments:
+                        if item['id'] not in fresh_ids:
+                            on_item(item)
+            
+            if self.store and (posts or comments):
+                self.store.save(username, posts, comments)
+            
             if not posts and not comments:
                 raise ValueError(f"No posts or comments found for user {username}")
             
-            return {
+            user_data = {
                 'username': username,
                 'user_info': user_info,
                 'posts': posts,
@@ -82,98 +224,241 @@ class RedditScraper:
                 'scraped_at': datetime.now().isoformat()
             }
             
+            if self.cache:
+                self.cache.set(cache_key, user_data)
+            
+            return user_data
+            
+        except ScrapeCancelled:
+            self.logger.info(f"Scrape of {username} cancelled")
+            raise
         except Exception as e:
             self.logger.error(f"Error scraping user data: {str(e)}")
             raise
     
-    def _scrape_posts(self, user) -> List[Dict]:
-        """Scrape user posts"""
+    def stream_user_data(self, username: str, **kwargs) -> 'ScrapeStream':
+        """
+        Start scraping in the background and stream records as pages arrive
+        
+        Args:
+            username: Reddit username (without u/ prefix)
+            **kwargs: Passed through to scrape_user_data
+            
+        Returns:
+            ScrapeStream to iterate items from; its result() is the usual user data dict
+        """
+        return ScrapeStream(self, username, **kwargs)
+    
+    def _scrape_posts(self, name: str, known_ids: Optional[set] = None, since_utc: float = 0,
+                      on_item: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Scrape user posts, newest first, stopping at the first already-known post"""
         posts = []
         
         try:
-            from config import MAX_POSTS, SCRAPING_DELAY
+            from config import MAX_POSTS
+            
+            monitor = self._new_monitor()
             
-            for i, post in enumerate(user.submissions.new(limit=MAX_POSTS)):
-                if i >= MAX_POSTS:
+            for post_data, stickied in self._iter_listing(name, 'submitted', MAX_POSTS):
+                if len(posts) >= MAX_POSTS:
                     break
+                if self._reached_known(post_data, stickied, known_ids, since_utc):
+                    break
+                posts.append(post_data)
+                if on_item:
+                    on_item(post_data)
+                if monitor:
+                    monitor.add(post_data)
+                    if monitor.should_stop():
+                        self.logger.info(f"Posts converged after {len(posts)} items (delta {monitor.last_delta:.3f})")
+                        break
                     
-                try:
-                    post_data = {
-                        'id': post.id,
-                        'title': post.title or '',
-                        'text': post.selftext or '',
-                        'score': getattr(post, 'score', 0),
-                        'upvote_ratio': getattr(post, 'upvote_ratio', 0.5),
-                        'subreddit': str(post.subreddit),
-                        'created_utc': post.created_utc,
-                        'num_comments': getattr(post, 'num_comments', 0),
-                        'url': getattr(post, 'url', ''),
-                        'permalink': f"https://reddit.com{post.permalink}",
-                        'type': 'post'
-                    }
-                    posts.append(post_data)
-                    
-                    # Add delay to respect rate limits
-                    time.sleep(SCRAPING_DELAY)
-                    
-                except Exception as e:
-                    self.logger.warning(f"Error processing post {post.id}: {e}")
-                    continue
-                    
+        except ScrapeCancelled:
+            raise
         except Exception as e:
             self.logger.warning(f"Error scraping posts: {str(e)}")
         
         return posts
     
-    def _scrape_comments(self, user) -> List[Dict]:
-        """Scrape user comments"""
+    def _scrape_comments(self, name: str, known_ids: Optional[set] = None, since_utc: float = 0,
+                         on_item: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Scrape user comments, newest first, stopping at the first already-known comment"""
         comments = []
         
         try:
-            from config import MAX_COMMENTS, SCRAPING_DELAY
+            from config import MAX_COMMENTS
+            
+            monitor = self._new_monitor()
             
-            for i, comment in enumerate(user.comments.new(limit=MAX_COMMENTS)):
-                if i >= MAX_COMMENTS:
+            for comment_data, stickied in self._iter_listing(name, 'comments', MAX_COMMENTS):
+                if len(comments) >= MAX_COMMENTS:
                     break
+                if self._reached_known(comment_data, stickied, known_ids, since_utc):
+                    break
+                comments.append(comment_data)
+                if on_item:
+                    on_item(comment_data)
+                if monitor:
+                    monitor.add(comment_data)
+                    if monitor.should_stop():
+                        self.logger.info(f"Comments converged after {len(comments)} items (delta {monitor.last_delta:.3f})")
+                        break
                     
-                try:
-                    comment_data = {
-                        'id': comment.id,
-                        'text': comment.body or '',
-                        'score': getattr(comment, 'score', 0),
-                        'subreddit': str(comment.subreddit),
-                        'created_utc': comment.created_utc,
-                        'permalink': f"https://reddit.com{comment.permalink}",
-                        'parent_id': getattr(comment, 'parent_id', ''),
-                        'type': 'comment'
-                    }
-                    comments.append(comment_data)
-                    
-                    # Add delay to respect rate limits
-                    time.sleep(SCRAPING_DELAY)
-                    
-                except Exception as e:
-                    self.logger.warning(f"Error processing comment {comment.id}: {e}")
-                    continue
-                    
+        except ScrapeCancelled:
+            raise
         except Exception as e:
             self.logger.warning(f"Error scraping comments: {str(e)}")
         
         return comments
     
-    def _get_user_info(self, user) -> Dict:
-        """Get basic user information"""
+    @staticmethod
+    def _new_monitor() -> Optional[ConvergenceMonitor]:
+        """Early-stopping monitor for one listing when ADAPTIVE_DEPTH is on"""
+        from config import ADAPTIVE_DEPTH, ADAPTIVE_MIN_ITEMS, ADAPTIVE_THRESHOLD
+        
+        if not ADAPTIVE_DEPTH:
+            return None
+        return ConvergenceMonitor(ADAPTIVE_MIN_ITEMS, ADAPTIVE_THRESHOLD, page_size=LISTING_PAGE_SIZE)
+    
+    def _iter_listing(self, name: str, listing: str, limit: int) -> Iterator[Tuple[Dict, bool]]:
+        """Yield (record, stickied) pairs from the configured fetch backend"""
+        if self.backend in ('json', 'replay'):
+            yield from JsonListingFetcher(self.reddit).iter_listing(name, listing, limit)
+            return
+        
+        # Bind the redditor to this thread's client, not the one that built the scraper
+        user = self.reddit.redditor(name)
+        if listing == 'submitted':
+            items, build = user.submissions.new(limit=limit), self._post_from_praw
+        else:
+            items, build = user.comments.new(limit=limit), self._comment_from_praw
+        
+        for item in items:
+            try:
+                yield build(item), getattr(item, 'stickied', False)
+            except Exception as e:
+                self.logger.warning(f"Error processing {listing} item {item.id}: {e}")
+                continue
+    
+    @staticmethod
+    def _post_from_praw(post) -> Dict:
+        return {
+            'id': post.id,
+            'title': post.title or '',
+            'text': post.selftext or '',
+            'score': getattr(post, 'score', 0),
+            'upvote_ratio': getattr(post, 'upvote_ratio', 0.5),
+            'subreddit': str(post.subreddit),
+            'created_utc': post.created_utc,
+            'num_comments': getattr(post, 'num_comments', 0),
+            'url': getattr(post, 'url', ''),
+            'permalink': f"https://reddit.com{post.permalink}",
+            'type': 'post'
+        }
+    
+    @staticmethod
+    def _comment_from_praw(comment) -> Dict:
+        return {
+            'id': comment.id,
+            'text': comment.body or '',
+            'score': getattr(comment, 'score', 0),
+            'subreddit': str(comment.subreddit),
+            'created_utc': comment.created_utc,
+            'permalink': f"https://reddit.com{comment.permalink}",
+            'parent_id': getattr(comment, 'parent_id', ''),
+            'type': 'comment'
+        }
+    
+    @staticmethod
+    def _reached_known(item: Dict, stickied: bool, known_ids: Optional[set], since_utc: float) -> bool:
+        """True once a listing reaches items covered by the stored corpus"""
+        if not known_ids and not since_utc:
+            return False
+        # Pinned items are listed first regardless of age
+        if stickied:
+            return False
+        return item['id'] in (known_ids or ()) or item['created_utc'] < since_utc
+    
+    def _get_user_info(self, username: str) -> Dict:
+        """
+        Fetch the user's profile with a single explicit about.json request
+        
+        Raises:
+            ValueError: If the account does not exist or is suspended
+        """
         try:
-            return {
-                'name': user.name,
-                'created_utc': getattr(user, 'created_utc', 0),
-                'comment_karma': getattr(user, 'comment_karma', 0),
-                'link_karma': getattr(user, 'link_karma', 0),
-                'is_gold': getattr(user, 'is_gold', False),
-                'is_mod': getattr(user, 'is_mod', False),
-                'has_verified_email': getattr(user, 'has_verified_email', False),
-                'account_age_days': (datetime.now().timestamp() - getattr(user, 'created_utc', 0)) / 86400
-            }
+            about = self.reddit.request(method='GET', path=f'/user/{username}/about')
+        except (prawcore.NotFound, prawcore.Forbidden):
+            raise ValueError(f"User {username} not found or suspended")
+        
+        data = about.get('data', {}) if isinstance(about, dict) else {}
+        if not data.get('name') or data.get('is_suspended'):
+            raise ValueError(f"User {username} not found or suspended")
+        
+        created_utc = data.get('created_utc') or 0
+        return {
+            'name': data['name'],
+            'created_utc': created_utc,
+            'comment_karma': data.get('comment_karma', 0),
+            'link_karma': data.get('link_karma', 0),
+            'is_gold': data.get('is_gold', False),
+            'is_mod': data.get('is_mod', False),
+            'has_verified_email': data.get('has_verified_email', False),
+            'account_age_days': (datetime.now().timestamp() - created_utc) / 86400
+        }
+
+
+class ScrapeStream:
+    """
+    Iterable of scraped post/comment records produced by a background scrape
+    
+    cancel() stops the scrape at its next record, so a consumer that fails
+    does not leave the thread paging Reddit and filling the queue.
+    """
+    
+    _DONE = object()
+    
+    def __init__(self, scraper: RedditScraper, username: str, **kwargs):
+        self.username = username
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._result = None
+        self._error = None
+        self._thread = threading.Thread(
+            target=self._run, args=(scraper, username, kwargs),
+            name=f'scrape-stream-{username}', daemon=True
+        )
+        self._thread.start()
+    
+    def _run(self, scraper: RedditScraper, username: str, kwargs: Dict):
+        try:
+            self._result = scraper.scrape_user_data(username, on_item=self._put, **kwargs)
         except Exception as e:
-            self.logger.warning(f"Error getting user info: {str(e)}")
-            return {'name': user.name}
+            self._error = e
+        finally:
+            self._queue.put(self._DONE)
+    
+    def _put(self, item: Dict):
+        if self._stop.is_set():
+            raise ScrapeCancelled(f"Scrape of {self.username} cancelled")
+        self._queue.put(item)
+    
+    def cancel(self):
+        """Ask the background scrape to stop; result() then raises ScrapeCancelled"""
+        self._stop.set()
+    
+    def __iter__(self) -> Iterator[Dict]:
+        while True:
+            item = self._queue.get()
+            if item is self._DONE:
+                break
+            yield item
+        if self._error:
+            raise self._error
+    
+    def result(self) -> Dict:
+        """Wait for the scrape to finish and return the complete user data"""
+        self._thread.join()
+        if self._error:
+            raise self._error
+        return self._result
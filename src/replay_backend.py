@@ -0,0 +1,273 @@
+"""
+Replay Backend Module
+Offline stand-in for the Reddit API that serves recorded or synthetic listings
+"""
+
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+import prawcore
+import requests
+
+from src.listing_fetcher import LISTING_PAGE_SIZE
+from src.rate_limiter import get_rate_limiter
+
+_USER_PATH = re.compile(r'^/user/([^/]+)/(about|submitted|comments)/?$')
+_LISTING_KINDS = {'submitted': 't3', 'comments': 't1'}
+
+
+def fixture_path(fixtures_dir: str, username: str) -> str:
+    return os.path.join(fixtures_dir, f"{username.lower()}.json")
+
+
+def write_fixture(fixtures_dir: str, fixture: Dict) -> str:
+    """Write a fixture ({'about', 'submitted', 'comments'}) and return its path"""
+    os.makedirs(fixtures_dir, exist_ok=True)
+    path = fixture_path(fixtures_dir, fixture['about']['name'])
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(fixture, f)
+    return path
+
+
+class _ReplayAuth:
+    """Mirrors praw.Reddit.auth so readiness checks work offline"""
+
+    def scopes(self) -> set:
+        return {'*'}
+
+
+class _ReplayRedditor:
+    """Lazy redditor handle; listings are always fetched through request()"""
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+class ReplayReddit:
+    """
+    Drop-in for the parts of praw.Reddit the JSON fetch path uses
+
+    Serves /user/{name}/about, /submitted and /comments from fixture files with
+    Reddit's pagination (limit/after), a configurable per-request latency and
+    synthesised X-Ratelimit headers fed into the shared rate limiter, so scrape
+    timings behave like the real API without any network access.
+    """
+
+    def __init__(self, fixtures_dir: str, latency: float = 0.0, jitter: float = 0.0,
+                 rate_limit: int = 1000, rate_window: float = 600.0, seed: Optional[int] = None):
+        self.logger = logging.getLogger(__name__)
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.auth = _ReplayAuth()
+        self.request_count = 0
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._fixtures: Dict[str, Optional[Dict]] = {}
+        self._window_start = time.monotonic()
+        self._window_used = 0
+
+    def redditor(self, name: str) -> _ReplayRedditor:
+        return _ReplayRedditor(name)
+
+    def request(self, *, method: str, path: str, params: Optional[Dict] = None, **kwargs):
+        """Return parsed JSON for a user endpoint, like praw.Reddit.request"""
+        limiter = get_rate_limiter()
+        limiter.acquire()
+        headers = self._charge()
+        self._simulate_latency()
+        limiter.update_from_headers(headers)
+
+        match = _USER_PATH.match(path)
+        if method.upper() != 'GET' or not match:
+            raise prawcore.NotFound(self._response(404, headers))
+
+        username, endpoint = match.groups()
+        fixture = self._load(username)
+        if fixture is None:
+            raise prawcore.NotFound(self._response(404, headers))
+
+        if endpoint == 'about':
+            return {'kind': 't2', 'data': fixture['about']}
+        return self._listing_page(fixture.get(endpoint, []), _LISTING_KINDS[endpoint], params or {})
+
+    def _listing_page(self, items: List[Dict], kind: str, params: Dict) -> Dict:
+        limit = min(int(params.get('limit', 25)), LISTING_PAGE_SIZE)
+        start = 0
+        after = params.get('after')
+        if after:
+            item_id = after.split('_', 1)[-1]
+            ids = [item['id'] for item in items]
+            start = ids.index(item_id) + 1 if item_id in ids else len(items)
+
+        page = items[start:start + limit]
+        has_more = start + limit < len(items)
+        return {
+            'kind': 'Listing',
+            'data': {
+                'after': f"{kind}_{page[-1]['id']}" if page and has_more else None,
+                'children': [{'kind': kind, 'data': item} for item in page]
+            }
+        }
+
+    def _load(self, username: str) -> Optional[Dict]:
+        key = username.lower()
+        with self._lock:
+            if key not in self._fixtures:
+                try:
+                    with open(fixture_path(self.fixtures_dir, key), 'r', encoding='utf-8') as f:
+                        self._fixtures[key] = json.load(f)
+                except FileNotFoundError:
+                    self._fixtures[key] = None
+            return self._fixtures[key]
+
+    def _charge(self) -> Dict[str, str]:
+        """Count the request against a fixed window and build Reddit-style headers"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.rate_window:
+                self._window_start = now
+                self._window_used = 0
+            self._window_used += 1
+            self.request_count += 1
+            reset = self.rate_window - (now - self._window_start)
+            return {
+                'x-ratelimit-used': str(self._window_used),
+                'x-ratelimit-remaining': str(float(max(0, self.rate_limit - self._window_used))),
+                'x-ratelimit-reset': str(int(reset))
+            }
+
+    def _simulate_latency(self):
+        delay = self.latency
+        if self.jitter:
+            with self._lock:
+                delay += self._random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    @staticmethod
+    def _response(status_code: int, headers: Dict[str, str]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers.update(headers)
+        return response
+
+
+def record_user(reddit, username: str, fixtures_dir: str, max_posts: int, max_comments: int) -> str:
+    """
+    Record a live user's about/submitted/comments JSON into a replay fixture
+
+    Args:
+        reddit: praw.Reddit (or anything with the same request() method)
+    """
+    def page_all(listing: str, limit: int) -> List[Dict]:
+        items = []
+        after = None
+        while len(items) < limit:
+            params = {'limit': min(LISTING_PAGE_SIZE, limit - len(items)), 'sort': 'new'}
+            if after:
+                params['after'] = after
+            page = reddit.request(method='GET', path=f'/user/{username}/{listing}', params=params)
+            children = page.get('data', {}).get('children', [])
+            items.extend(child['data'] for child in children)
+            after = page.get('data', {}).get('after')
+            if not after or not children:
+                break
+        return items[:limit]
+
+    about = reddit.request(method='GET', path=f'/user/{username}/about')
+    return write_fixture(fixtures_dir, {
+        'about': about['data'],
+        'submitted': page_all('submitted', max_posts),
+        'comments': page_all('comments', max_comments)
+    })
+
+
+_SYNTHETIC_SUBREDDITS = [
+    'python', 'learnprogramming', 'gaming', 'pcgaming', 'nba', 'soccer', 'politics',
+    'movies', 'television', 'personalfinance', 'investing', 'fitness', 'AskReddit', 'science'
+]
+_SYNTHETIC_WORDS = (
+    'code software game team season vote policy movie music money stock crypto health fitness '
+    'school study learn player match election show film investment doctor exercise university '
+    'really think people time work today year great problem question answer help love hate'
+).split()
+
+
+def generate_synthetic_user(username: str, posts: int = 100, comments: int = 200,
+                            seed: Optional[int] = None, now: Optional[float] = None) -> Dict:
+    """Build a plausible fixture with the given number of posts and comments"""
+    rng = random.Random(seed if seed is not None else username)
+    now = now or time.time()
+    created = now - rng.randint(200, 4000) * 86400
+
+    def sentence(words: int) -> str:
+        text = ' '.join(rng.choice(_SYNTHETIC_WORDS) for _ in range(words))
+        return text.capitalize() + rng.choice(['.', '.', '!', '?'])
+
+    def timeline(count: int) -> List[float]:
+        # Newest first, with bursty gaps like real activity
+        stamps = []
+        t = now - rng.uniform(0, 86400)
+        for _ in range(count):
+            stamps.append(round(t))
+            t -= rng.expovariate(1 / 28800)
+        return stamps
+
+    submitted = []
+    for i, ts in enumerate(timeline(posts)):
+        subreddit = rng.choice(_SYNTHETIC_SUBREDDITS)
+        item_id = f"p{i:x}{rng.randint(0, 0xffff):04x}"
+        submitted.append({
+            'id': item_id,
+            'name': f't3_{item_id}',
+            'title': sentence(rng.randint(4, 12)),
+            'selftext': ' '.join(sentence(rng.randint(5, 25)) for _ in range(rng.randint(0, 6))),
+            'score': rng.randint(0, 500),
+            'upvote_ratio': round(rng.uniform(0.5, 1.0), 2),
+            'subreddit': subreddit,
+            'created_utc': ts,
+            'num_comments': rng.randint(0, 200),
+            'url': f'https://www.reddit.com/r/{subreddit}/comments/{item_id}/',
+            'permalink': f'/r/{subreddit}/comments/{item_id}/',
+            'stickied': False
+        })
+
+    comment_items = []
+    for i, ts in enumerate(timeline(comments)):
+        subreddit = rng.choice(_SYNTHETIC_SUBREDDITS)
+        item_id = f"c{i:x}{rng.randint(0, 0xffff):04x}"
+        comment_items.append({
+            'id': item_id,
+            'name': f't1_{item_id}',
+            'body': ' '.join(sentence(rng.randint(3, 30)) for _ in range(rng.randint(1, 5))),
+            'score': rng.randint(-5, 300),
+            'subreddit': subreddit,
+            'created_utc': ts,
+            'permalink': f'/r/{subreddit}/comments/x/_/{item_id}/',
+            'parent_id': f't3_{rng.randint(0, 0xffffff):06x}',
+            'stickied': False
+        })
+
+    return {
+        'about': {
+            'name': username,
+            'created_utc': created,
+            'comment_karma': sum(max(0, c['score']) for c in comment_items),
+            'link_karma': sum(p['score'] for p in submitted),
+            'is_gold': False,
+            'is_mod': rng.random() < 0.1,
+            'has_verified_email': True
+        },
+        'submitted': submitted,
+        'comments': comment_items
+    }
@@ -0,0 +1,82 @@
+"""
+Scrape Store Module
+Persists each user's scraped corpus so later runs only fetch new items
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from typing import Dict, List
+
+
+class ScrapeStore:
+    """Local JSON store of already-seen posts/comments and per-user high-water marks"""
+
+    def __init__(self, directory: str):
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self, username: str) -> Dict:
+        """
+        Load the stored corpus for a user
+
+        Returns:
+            Dictionary with 'posts', 'comments', 'post_ids', 'comment_ids',
+            'newest_post_utc' and 'newest_comment_utc' (empty when unseen)
+        """
+        path = self._path(username)
+        data = {'posts': [], 'comments': []}
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable scrape store for {username}: {e}")
+
+        posts = data.get('posts', [])
+        comments = data.get('comments', [])
+        return {
+            'posts': posts,
+            'comments': comments,
+            'post_ids': {p['id'] for p in posts},
+            'comment_ids': {c['id'] for c in comments},
+            'newest_post_utc': max((p.get('created_utc', 0) for p in posts), default=0),
+            'newest_comment_utc': max((c.get('created_utc', 0) for c in comments), default=0)
+        }
+
+    def save(self, username: str, posts: List[Dict], comments: List[Dict]):
+        """Atomically replace the stored corpus for a user"""
+        path = self._path(username)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+
+        with self._lock:
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'username': username, 'posts': posts, 'comments': comments}, f)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                self.logger.warning(f"Could not update scrape store for {username}: {e}")
+
+    def _path(self, username: str) -> str:
+        safe_name = re.sub(r'[^A-Za-z0-9_-]', '_', username.lower())
+        return os.path.join(self.directory, f"{safe_name}.json")
+
+
+def merge_items(new_items: List[Dict], stored_items: List[Dict], limit: int) -> List[Dict]:
+    """Merge freshly scraped items over stored ones, newest first, capped at limit"""
+    seen = set()
+    merged = []
+    for item in new_items + stored_items:
+        if item['id'] in seen:
+            continue
+        seen.add(item['id'])
+        merged.append(item)
+
+    merged.sort(key=lambda item: item.get('created_utc', 0), reverse=True)
+    return merged[:limit]
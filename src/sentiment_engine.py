@@ -0,0 +1,127 @@
+"""
+Sentiment Engine Module
+Batched, memoized VADER + TextBlob scoring shared across the process
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from textblob.en.sentiments import PatternAnalyzer
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+
+class SentimentEngine:
+    """
+    Scores texts with VADER and TextBlob's pattern analyzer
+
+    Results are memoized by content hash in a bounded LRU, so reposted text and
+    re-runs over a cached corpus skip scoring entirely. Time spent in each
+    backend is accumulated and reported by stats().
+    """
+
+    def __init__(self, cache_size: int = 10000):
+        self.logger = logging.getLogger(__name__)
+        self.cache_size = cache_size
+        self.vader = SentimentIntensityAnalyzer()
+        # Same analyzer TextBlob(text).sentiment uses, without building a TextBlob per text
+        self.textblob = PatternAnalyzer()
+
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'texts': 0,
+            'cache_hits': 0,
+            'vader_calls': 0,
+            'vader_seconds': 0.0,
+            'textblob_calls': 0,
+            'textblob_seconds': 0.0
+        }
+
+    def score(self, text: str) -> Dict:
+        """Score a single text"""
+        return self.score_batch([text])[0]
+
+    def score_batch(self, texts: List[str]) -> List[Dict]:
+        """
+        Score a list of texts in one call
+
+        Duplicates within the batch and texts seen before are scored once.
+
+        Returns:
+            One sentiment dict per input text, in order
+        """
+        keys = [hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest() for text in texts]
+        results: List[Optional[Dict]] = [None] * len(texts)
+        pending: Dict[bytes, List[int]] = {}
+
+        with self._lock:
+            self._stats['texts'] += len(texts)
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    self._stats['cache_hits'] += 1
+                    results[i] = dict(cached)
+                else:
+                    pending.setdefault(key, []).append(i)
+
+        if pending:
+            scored = {key: self._compute(texts[indexes[0]]) for key, indexes in pending.items()}
+            with self._lock:
+                for key, sentiment in scored.items():
+                    self._cache[key] = sentiment
+                    self._cache.move_to_end(key)
+                    for i in pending[key]:
+                        results[i] = dict(sentiment)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return results
+
+    def stats(self) -> Dict:
+        """Counters plus cumulative seconds spent in each backend"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['cache_size'] = len(self._cache)
+        return stats
+
+    def _compute(self, text: str) -> Dict:
+        start = time.perf_counter()
+        scores = self.vader.polarity_scores(text)
+        vader_done = time.perf_counter()
+        blob = self.textblob.analyze(text)
+        blob_done = time.perf_counter()
+
+        with self._lock:
+            self._stats['vader_calls'] += 1
+            self._stats['vader_seconds'] += vader_done - start
+            self._stats['textblob_calls'] += 1
+            self._stats['textblob_seconds'] += blob_done - vader_done
+
+        return {
+            'vader_compound': scores['compound'],
+            'vader_positive': scores['pos'],
+            'vader_negative': scores['neg'],
+            'vader_neutral': scores['neu'],
+            'textblob_polarity': blob.polarity,
+            'textblob_subjectivity': blob.subjectivity
+        }
+
+
+_shared_engine: Optional[SentimentEngine] = None
+_shared_lock = threading.Lock()
+
+
+def get_sentiment_engine() -> SentimentEngine:
+    """Return the engine (and its memo cache) shared by every processor in this process"""
+    global _shared_engine
+    with _shared_lock:
+        if _shared_engine is None:
+            from config import SENTIMENT_CACHE_SIZE
+
+            _shared_engine = SentimentEngine(cache_size=SENTIMENT_CACHE_SIZE)
+        return _shared_engine
@@ -0,0 +1,47 @@
+import os
+import sys
+import unittest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from src.adaptive_depth import ConvergenceMonitor
+
+STEADY = [
+    {'title': 'Upgraded my gaming pc', 'text': 'Love the new graphics card', 'subreddit': 'buildapc'},
+    {'title': 'Weekend hiking trip', 'text': 'Great trail, awful weather', 'subreddit': 'hiking'},
+]
+
+
+def _first_stop(monitor, items):
+    for item in items:
+        monitor.add(item)
+        if monitor.should_stop():
+            return monitor.count
+    return None
+
+
+class TestConvergenceMonitor(unittest.TestCase):
+    def test_converging_stream_stops_at_first_page_boundary(self):
+        monitor = ConvergenceMonitor(min_items=100, threshold=0.05, page_size=100)
+        self.assertEqual(_first_stop(monitor, STEADY * 200), 100)
+        self.assertLess(monitor.last_delta, 0.05)
+
+    def test_stops_only_at_page_boundaries(self):
+        monitor = ConvergenceMonitor(min_items=10, threshold=0.05, page_size=40, check_every=10)
+        self.assertEqual(_first_stop(monitor, STEADY * 100), 40)
+
+    def test_non_converging_stream_never_stops(self):
+        items = [dict(STEADY[0], subreddit=f'sub{i}') for i in range(400)]
+        monitor = ConvergenceMonitor(min_items=100, threshold=0.05, page_size=100)
+        self.assertIsNone(_first_stop(monitor, items))
+        self.assertGreater(monitor.last_delta, 0.05)
+
+    def test_min_items_floor(self):
+        monitor = ConvergenceMonitor(min_items=150, threshold=0.05, page_size=100)
+        self.assertEqual(_first_stop(monitor, STEADY * 200), 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
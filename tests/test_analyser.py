@@ -1,17 +1,129 @@
+import json
 import os
 import sys
+import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
 
 _ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if _ROOT not in sys.path:
     sys.path.insert(0, _ROOT)
 
-from src.persona_analyzer import PersonaAnalyzer
+from src.persona_analyzer import PERSONA_SECTIONS, PersonaAnalyzer
+from utils.disk_cache import DiskCache
+
+# Build analyzers without the on-disk LLM cache, so tests never create cache/llm
+_no_llm_cache = [
+    mock.patch('config.LLM_CACHE_TTL', 0),
+    mock.patch.multiple('src.persona_analyzer', _llm_cache=None, _llm_cache_ready=False),
+]
+
+
+def setUpModule():
+    for patcher in _no_llm_cache:
+        patcher.start()
+
+
+def tearDownModule():
+    for patcher in reversed(_no_llm_cache):
+        patcher.stop()
+
+
+def _analyzer(cache=None):
+    analyzer = PersonaAnalyzer()
+    analyzer.cache = cache
+    return analyzer
+
 
 class TestPersonaAnalyzer(unittest.TestCase):
     def test_initialization(self):
         analyzer = PersonaAnalyzer()
         self.assertIsNotNone(analyzer.model)
 
+    def test_sections_run_concurrently(self):
+        analyzer = _analyzer()
+
+        def slow_request(prompt, *args):
+            time.sleep(0.3)
+            return '{"ok": true}'
+
+        with mock.patch.object(analyzer, '_request', side_effect=slow_request):
+            started = time.perf_counter()
+            persona = analyzer.analyze_persona({'username': 'someone'})
+            elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(persona['personality'], {'ok': True})
+        self.assertEqual(persona['goals_needs'], {'ok': True})
+
+    def test_section_errors_are_isolated(self):
+        analyzer = _analyzer()
+        lock = threading.Lock()
+        calls = []
+
+        def flaky_request(prompt, *args):
+            with lock:
+                calls.append(prompt)
+            if 'demographic' in prompt:
+                raise RuntimeError('rate limited')
+            return '{"ok": true}'
+
+        with mock.patch.object(analyzer, '_request', side_effect=flaky_request):
+            persona = analyzer.analyze_persona({'username': 'someone'})
+        self.assertEqual(len(calls), 6)
+        self.assertIn('rate limited', persona['demographics']['error'])
+        self.assertEqual(persona['motivations'], {'ok': True})
+
+        with mock.patch.object(analyzer, '_request', side_effect=RuntimeError('bad key')):
+            with self.assertRaises(RuntimeError):
+                analyzer.analyze_persona({'username': 'someone'})
+
+    def test_single_prompt_mode_rerequests_missing_sections(self):
+        analyzer = _analyzer()
+        combined = {key: {'ok': True} for key, _ in PERSONA_SECTIONS}
+        combined['frustrations'] = 'not an object'
+        del combined['goals_needs']
+        calls = []
+
+        def request(prompt, max_tokens=1000, json_mode=False):
+            calls.append(json_mode)
+            if json_mode:
+                return json.dumps(combined)
+            return '{"retried": true}'
+
+        with mock.patch.object(analyzer, '_request', side_effect=request):
+            persona = analyzer.analyze_persona({'username': 'someone'}, mode='single')
+
+        self.assertEqual(sorted(calls), [False, False, True])
+        self.assertEqual(persona['demographics'], {'ok': True})
+        self.assertEqual(persona['frustrations'], {'retried': True})
+        self.assertEqual(persona['goals_needs'], {'retried': True})
+
+    def test_responses_are_cached(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = DiskCache(directory, ttl=60, max_bytes=1 << 20)
+            calls = []
+
+            def request(prompt, *args):
+                calls.append(prompt)
+                return 'not json' if 'frustrations' in prompt else '{"ok": true}'
+
+            with mock.patch.object(PersonaAnalyzer, '_request', side_effect=request):
+                first = _analyzer(cache).analyze_persona({'username': 'someone'})
+                self.assertEqual(len(calls), 6)
+                second = _analyzer(cache).analyze_persona({'username': 'someone'})
+
+            # Only the unparseable response is requested again
+            self.assertEqual(len(calls), 7)
+            self.assertEqual(first['goals_needs'], second['goals_needs'])
+            self.assertEqual(cache.stats()['hits'], 5)
+            self.assertEqual(second['llm_cache'], {'enabled': True, 'hits': 5, 'misses': 7, 'evictions': 0})
+
+    def test_cache_stats_without_cache(self):
+        self.assertEqual(_analyzer().cache_stats(), {'enabled': False, 'hits': 0, 'misses': 0, 'evictions': 0})
+
+
 if __name__ == "__main__":
     unittest.main()
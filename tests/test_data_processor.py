@@ -0,0 +1,161 @@
+import os
+import random
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+import config
+from src.data_processor import DataProcessor, analyze_comments
+from src.item_store import NUMERIC_COLUMNS, ItemStore
+from src.reddit_scraper import RedditScraper
+from src.replay_backend import ReplayReddit, generate_synthetic_user, write_fixture
+from utils.prefilter import PreFilter
+
+MONDAY_9AM_UTC = 1704099600  # 2024-01-01 09:00:00 UTC
+
+
+def _store(kind, records):
+    store = ItemStore(kind)
+    for record in records:
+        store.append(record, 'some cleaned text', 'title' if kind == 'post' else None)
+    return store
+
+
+class TestActivityPatterns(unittest.TestCase):
+    def setUp(self):
+        self.processor = DataProcessor()
+
+    def test_histograms_and_detail(self):
+        posts = _store('post', [{'created_utc': MONDAY_9AM_UTC, 'subreddit': 'python'}])
+        comments = _store('comment', [
+            {'created_utc': MONDAY_9AM_UTC + 600, 'subreddit': 'gaming'},
+            {'created_utc': MONDAY_9AM_UTC + 86400 * 2, 'subreddit': 'python'},
+        ])
+        patterns, detail = self.processor._analyze_activity(posts, comments)
+
+        self.assertEqual(patterns['total_activity'], 3)
+        self.assertEqual(patterns['most_active_day'], 0)
+        self.assertEqual(patterns['most_active_hour'], 9)
+        self.assertEqual(patterns['day_distribution'], {0: 2, 1: 0, 2: 1, 3: 0, 4: 0, 5: 0, 6: 0})
+        self.assertEqual(patterns['top_subreddits'], [('python', 2), ('gaming', 1)])
+        self.assertEqual(patterns['posting_frequency'], 1.5)
+
+        self.assertEqual(detail['day_hour_heatmap'][0][9], 2)
+        self.assertEqual(detail['day_hour_heatmap'][2][9], 1)
+        self.assertEqual(detail['gap_distribution'], {'<1h': 1, '1-6h': 0, '6-24h': 0, '1-7d': 1, '>7d': 0})
+
+    def test_empty(self):
+        self.assertEqual(self.processor._analyze_activity(ItemStore('post'), ItemStore('comment'))[0], {})
+
+
+class TestPreFilterStage(unittest.TestCase):
+    def test_duplicates_are_dropped_before_nlp(self):
+        too_long = 'far too long ' * 400
+        normal = "I finally switched my whole home lab over to proxmox"
+        texts = [too_long, too_long, normal, normal, normal + ' lol']
+        comments = [{'id': str(i), 'text': text} for i, text in enumerate(texts)]
+        prefilter = PreFilter(enabled=True, min_length=10, near_duplicate_threshold=0.8)
+
+        with mock.patch('src.data_processor.analyze_comments', wraps=analyze_comments) as analyze:
+            store = DataProcessor()._process_comments(comments, prefilter)
+        self.assertEqual(analyze.call_args[0][0], [too_long, normal])
+        self.assertEqual([record['id'] for record in store.records], ['2'])
+        self.assertEqual(prefilter.report()['dropped']['duplicate'], 2)
+        self.assertEqual(prefilter.report()['dropped']['near_duplicate'], 1)
+
+
+class _FakeStream:
+    """ScrapeStream stand-in yielding records in a given completion order"""
+
+    def __init__(self, user_data, order):
+        self.user_data = user_data
+        self.order = order
+        self.cancelled = False
+
+    def __iter__(self):
+        return iter(self.order)
+
+    def result(self):
+        return self.user_data
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TestStreamingEquivalence(unittest.TestCase):
+    def setUp(self):
+        fixtures = tempfile.mkdtemp()
+        write_fixture(fixtures, generate_synthetic_user('stream_user', posts=40, comments=80, seed=5))
+        saved = (config.CORPUS_CACHE_TTL, config.INCREMENTAL_SCRAPE)
+        config.CORPUS_CACHE_TTL, config.INCREMENTAL_SCRAPE = 0, False
+        try:
+            scraper = RedditScraper(reddit=ReplayReddit(fixtures), backend='replay')
+            self.user_data = scraper.scrape_user_data('stream_user', use_cache=False)
+        finally:
+            config.CORPUS_CACHE_TTL, config.INCREMENTAL_SCRAPE = saved
+
+        # Give the pre-filter something to drop
+        comments = self.user_data['comments']
+        comments[3] = dict(comments[3], text='[deleted]')
+        comments[10] = dict(comments[10], text=comments[2]['text'].upper())
+        comments[11] = dict(comments[11], text=comments[2]['text'] + ' lol')
+        comments[20] = dict(comments[20], text='far too long ' * 400)
+        comments[21] = dict(comments[21], text='far too long ' * 400)
+        posts = self.user_data['posts']
+        posts[5] = dict(posts[5], title=posts[1]['title'], text=posts[1]['text'])
+
+    def test_completion_order_matches_batch(self):
+        order = self.user_data['posts'] + self.user_data['comments']
+        random.Random(0).shuffle(order)
+
+        batch = DataProcessor().process_user_data(self.user_data)
+        streamed = DataProcessor().process_user_stream(_FakeStream(self.user_data, order))
+
+        self.assertGreater(sum(batch['prefilter']['comments']['dropped'].values()), 2)
+        for kind in ('posts', 'comments'):
+            self.assertEqual(streamed[kind].records, batch[kind].records)
+            self.assertEqual(streamed[kind].texts(), batch[kind].texts())
+            self.assertEqual(streamed[kind].topic_hits, batch[kind].topic_hits)
+            for column in NUMERIC_COLUMNS:
+                self.assertEqual(streamed[kind].column(column).tolist(), batch[kind].column(column).tolist(), column)
+        for key in batch:
+            if key not in ('posts', 'comments', 'processed_at'):
+                self.assertEqual(streamed[key], batch[key], key)
+
+    def test_failure_cancels_the_stream(self):
+        stream = _FakeStream(self.user_data, self.user_data['posts'])
+        with mock.patch.object(DataProcessor, '_process_post', side_effect=RuntimeError('boom')):
+            with self.assertRaises(RuntimeError):
+                DataProcessor().process_user_stream(stream)
+        self.assertTrue(stream.cancelled)
+
+    def test_warns_that_parallel_processing_does_not_apply(self):
+        order = self.user_data['posts'] + self.user_data['comments']
+        with mock.patch('config.PARALLEL_PROCESSING', True), \
+                self.assertLogs('src.data_processor', level='WARNING') as logs:
+            DataProcessor().process_user_stream(_FakeStream(self.user_data, order))
+        self.assertIn('PARALLEL_PROCESSING has no effect', logs.output[0])
+
+
+class TestParallelProcessing(unittest.TestCase):
+    def test_sharded_rows_match_serial(self):
+        from src.parallel_nlp import run_sharded
+
+        texts = [f"Comment {i}: I love python and hate [deleted] bugs!" for i in range(7)] + ['', 'ok']
+        serial = analyze_comments(texts)
+        with mock.patch('config.PARALLEL_PROCESSING', True), \
+                mock.patch('config.PARALLEL_MIN_ITEMS', 2), \
+                mock.patch('config.PARALLEL_WORKERS', 2):
+            parallel = run_sharded(analyze_comments, texts)
+
+        self.assertEqual(parallel, serial)
+        self.assertIsNone(parallel[-2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from utils.disk_cache import DiskCache
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def test_round_trip(self):
+        cache = DiskCache(self.directory, ttl=60, max_bytes=1024 * 1024)
+        cache.set("user", {"posts": [1, 2]})
+        self.assertEqual(cache.get("user"), {"posts": [1, 2]})
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_expired_entry_is_a_miss(self):
+        cache = DiskCache(self.directory, ttl=0.01, max_bytes=1024 * 1024)
+        cache.set("user", {"posts": []})
+        time.sleep(0.05)
+        self.assertIsNone(cache.get("user"))
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = DiskCache(self.directory, ttl=60, max_bytes=400)
+        cache.set("a", "x" * 100)
+        cache.set("b", "x" * 100)
+        past = time.time() - 10
+        os.utime(cache._path("b"), (past, past))
+        cache.get("a")
+        cache.set("c", "x" * 100)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import pickle
+import sys
+import unittest
+from unittest import mock
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+import nltk
+
+from src.item_store import ItemStore, SENTIMENT_FIELDS
+from utils.text_utils import TextAnalysis, calculate_readability
+
+
+def _has_stopwords():
+    try:
+        nltk.data.find('corpora/stopwords')
+        return True
+    except LookupError:
+        return False
+
+
+def _sentiment(value):
+    return {field: value for field in SENTIMENT_FIELDS}
+
+
+class _Analysis(TextAnalysis):
+    """Real analysis, except keywords skip the stopword filter (it needs NLTK data)"""
+
+    __slots__ = ()
+
+    def keywords(self, top_n=10):
+        return [word for word in self.words if len(word) > 2][:top_n]
+
+
+@mock.patch('src.item_store.TextAnalysis', _Analysis)
+class TestItemStore(unittest.TestCase):
+    def setUp(self):
+        self.record = {'id': 'p1', 'title': 'Raw Title', 'text': 'raw body', 'score': 7,
+                       'subreddit': 'python', 'created_utc': 1704099600}
+        self.store = ItemStore('post')
+        index = self.store.append(self.record, 'body', 'title', {'technology': 1})
+        self.store.set_sentiment(index, _sentiment(0.5))
+
+    def test_view_matches_processed_dict(self):
+        item = self.store[0]
+        self.assertIs(self.store.records[0], self.record)
+        self.assertEqual(item['text'], 'raw body')
+        self.assertEqual(item['total_text'], 'title body')
+        self.assertEqual(item['text_length'], 10)
+        self.assertEqual(item['sentiment'], _sentiment(0.5))
+        self.assertEqual(item.get('topic_hits'), {'technology': 1})
+        self.assertIsNone(item.get('missing'))
+        self.assertEqual(list(item)[:6], ['id', 'title', 'text', 'score', 'subreddit', 'created_utc'])
+        self.assertEqual(len(item), len(dict(item)))
+
+    def test_text_features_are_lazy(self):
+        with mock.patch('src.item_store.TextAnalysis', wraps=_Analysis) as analysis:
+            item = self.store[0]
+            self.assertIn('keywords', item)
+            self.assertEqual(analysis.call_count, 0)
+            self.assertEqual(item['keywords'], ['title', 'body'])
+            self.assertEqual(item['readability'], calculate_readability('title body'))
+            self.assertEqual(analysis.call_count, 1)
+
+    def test_columns_slices_and_take(self):
+        self.store.append({'id': 'p2', 'score': 3, 'created_utc': 1}, 'second body', 'second')
+        self.assertEqual(self.store.column('score').tolist(), [7.0, 3.0])
+        self.assertEqual([item['id'] for item in self.store[:5]], ['p1', 'p2'])
+        self.assertIsNone(self.store[-1]['sentiment'])
+
+        reordered = self.store.take([1, 0])
+        self.assertEqual([item['id'] for item in reordered], ['p2', 'p1'])
+        self.assertEqual(reordered[1]['sentiment'], _sentiment(0.5))
+
+    def test_pickles(self):
+        copy = pickle.loads(pickle.dumps(self.store))
+        self.assertEqual(dict(copy[0]), dict(self.store[0]))
+
+
+class TestItemStoreReadability(unittest.TestCase):
+    def test_readability_does_not_need_stopwords(self):
+        store = ItemStore('comment')
+        store.append({'id': 'c1'}, 'The cat sat on the mat.')
+        with mock.patch('utils.text_utils.get_stop_words', side_effect=LookupError):
+            with self.assertRaises(LookupError):
+                store[0]['keywords']
+            self.assertEqual(store[0]['readability'], 116.15)
+
+        store.append({'id': 'c2'}, 'The cat sat on the mat.')
+        self.assertEqual(store[1]['readability'], calculate_readability('The cat sat on the mat.'))
+
+
+@unittest.skipUnless(_has_stopwords(), 'NLTK stopwords data not installed')
+class TestItemStoreKeywords(unittest.TestCase):
+    def test_keywords_drop_stopwords(self):
+        store = ItemStore('comment')
+        store.append({'id': 'c1'}, 'the keyboard and the switch')
+        self.assertEqual(store[0]['keywords'], ['keyboard', 'switch'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import sys
+import tempfile
+import unittest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from config import BACKGROUND_IDF_PATH
+from utils.keyword_profile import BackgroundIDF, TermMatrix, build_background_idf, distinctive_terms
+
+
+class TestKeywordProfile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, 'idf.npy')
+        build_background_idf({'the': 0.05, 'and': 0.3, 'keyboard': 7.0, 'switch': 5.0, 'x' * 30: 9.0}, path)
+        self.background = BackgroundIDF(path)
+
+    def tearDown(self):
+        del self.background
+        self.tmp.cleanup()
+
+    def test_lookup(self):
+        idf = self.background.lookup(['switch', 'the', 'proxmox', 'x' * 30])
+        self.assertAlmostEqual(idf[0], 5.0)
+        self.assertAlmostEqual(idf[1], 0.05)
+        self.assertAlmostEqual(idf[2], self.background.unknown_idf)
+        self.assertAlmostEqual(self.background.unknown_idf, 2.65, places=5)
+        self.assertAlmostEqual(idf[3], 2.65, places=5)
+
+    def test_matrix(self):
+        matrix = TermMatrix(["The keyboard, the switch", "", "the THE keyboard"])
+        self.assertEqual(matrix.rows, 3)
+        self.assertEqual(matrix.vocabulary, ['the', 'keyboard', 'switch'])
+        self.assertEqual(matrix.term_counts().tolist(), [4, 2, 1])
+        self.assertEqual(matrix.document_frequency().tolist(), [2, 2, 1])
+        self.assertEqual(matrix.rows_with(1, 5), [0, 2])
+
+    def test_distinctive_terms(self):
+        texts = ["the new keyboard and the switch", "and the keyboard again", "the proxmox box", "proxmox and the keyboard"]
+        profile = distinctive_terms(TermMatrix(texts), self.background, top_n=3, sources=2)
+        self.assertEqual([entry['term'] for entry in profile], ['keyboard', 'proxmox'])
+        self.assertEqual(profile[0]['items'], 3)
+        self.assertEqual(profile[0]['rows'], [0, 1])
+        self.assertEqual(distinctive_terms(TermMatrix([]), self.background), [])
+
+    def test_slang_does_not_outrank_topical_terms(self):
+        background = BackgroundIDF(BACKGROUND_IDF_PATH)
+        texts = (["lol gonna check reddit and youtube, upvote this subreddit lol"] * 12
+                 + ["our kubernetes cluster keeps restarting pods", "moved the kubernetes nodes to proxmox"] * 3)
+        profile = [entry['term'] for entry in distinctive_terms(TermMatrix(texts), background, top_n=5)]
+        self.assertEqual(profile[0], 'kubernetes')
+        self.assertFalse({'lol', 'gonna', 'reddit', 'youtube', 'upvote', 'subreddit'} & set(profile))
+        del background
+
+    def test_stopwords_and_contractions_are_excluded(self):
+        background = BackgroundIDF(BACKGROUND_IDF_PATH)
+        texts = [
+            "thats the patch i was waiting for, dont care what they say", "cant believe the patch ranked this high",
+            "dont think thats right", "ranked games are broken after the patch", "i cant play ranked anymore",
+            "thats why i dont play", "the new patch is great", "ranked matchmaking is the worst",
+        ]
+        profile = distinctive_terms(TermMatrix(texts), background)
+        terms = [entry['term'] for entry in profile]
+        self.assertEqual(terms[:2], ['ranked', 'patch'])
+        self.assertFalse({'the', 'thats', 'dont', 'cant'} & set(terms))
+        self.assertTrue(all(entry['score'] >= 2.0 for entry in profile))
+        del background
+
+
+if __name__ == '__main__':
+    unittest.main()
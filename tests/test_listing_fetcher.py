@@ -0,0 +1,85 @@
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from src.listing_fetcher import JsonListingFetcher
+from src.reddit_scraper import RedditScraper
+
+POST = {
+    'id': 'p1', 'title': 'My build', 'selftext': 'Finally done', 'score': 42, 'upvote_ratio': 0.93,
+    'subreddit': 'buildapc', 'created_utc': 1700000000.0, 'num_comments': 7,
+    'url': 'https://example.com/build', 'permalink': '/r/buildapc/comments/p1/my_build/', 'stickied': True
+}
+COMMENT = {
+    'id': 'c1', 'body': 'Nice cable management', 'score': 3, 'subreddit': 'buildapc',
+    'created_utc': 1700000100.0, 'permalink': '/r/buildapc/comments/p1/_/c1/', 'parent_id': 't3_p1'
+}
+
+
+class _StubReddit:
+    """Serves `total` comments, newest first, in pages keyed by the 'after' cursor"""
+
+    def __init__(self, total):
+        self.items = [dict(COMMENT, id=f'c{i}', created_utc=2000000000 - i) for i in range(total)]
+        self.calls = []
+
+    def request(self, method, path, params):
+        self.calls.append((path, dict(params)))
+        start = int(params['after'][3:]) + 1 if 'after' in params else 0
+        page = self.items[start:start + params['limit']]
+        after = f"t1_{start + len(page) - 1}" if start + len(page) < len(self.items) else None
+        return {'data': {'children': [{'kind': 't1', 'data': item} for item in page], 'after': after}}
+
+
+class TestJsonListingFetcher(unittest.TestCase):
+    def test_pages_with_after(self):
+        reddit = _StubReddit(250)
+        records = [record for record, _ in JsonListingFetcher(reddit).iter_listing('someone', 'comments', 1000)]
+
+        self.assertEqual([record['id'] for record in records], [f'c{i}' for i in range(250)])
+        self.assertEqual([params.get('after') for _, params in reddit.calls], [None, 't1_99', 't1_199'])
+        self.assertEqual(reddit.calls[0][0], '/user/someone/comments')
+
+    def test_limit_cuts_off_without_extra_requests(self):
+        reddit = _StubReddit(250)
+        records = list(JsonListingFetcher(reddit).iter_listing('someone', 'comments', 150))
+
+        self.assertEqual(len(records), 150)
+        self.assertEqual([params['limit'] for _, params in reddit.calls], [100, 50])
+
+        reddit = _StubReddit(250)
+        listing = JsonListingFetcher(reddit).iter_listing('someone', 'comments', 1000)
+        for _ in zip(range(100), listing):
+            pass
+        self.assertEqual(len(reddit.calls), 1)
+
+    def test_skips_malformed_items(self):
+        reddit = _StubReddit(3)
+        del reddit.items[1]['created_utc']
+        records = [record['id'] for record, _ in JsonListingFetcher(reddit).iter_listing('someone', 'comments', 10)]
+        self.assertEqual(records, ['c0', 'c2'])
+
+    def test_records_match_praw_path(self):
+        decode_post = JsonListingFetcher.LISTINGS['submitted']
+        decode_comment = JsonListingFetcher.LISTINGS['comments']
+
+        self.assertEqual(decode_post(POST), RedditScraper._post_from_praw(SimpleNamespace(**POST)))
+        self.assertEqual(decode_comment(COMMENT), RedditScraper._comment_from_praw(SimpleNamespace(**COMMENT)))
+
+    def test_stickied_flag(self):
+        class _OnePost:
+            def request(self, method, path, params):
+                return {'data': {'children': [{'kind': 't3', 'data': POST}], 'after': None}}
+
+        (record, stickied), = JsonListingFetcher(_OnePost()).iter_listing('someone', 'submitted', 10)
+        self.assertEqual(record['type'], 'post')
+        self.assertTrue(stickied)
+
+
+if __name__ == '__main__':
+    unittest.main()
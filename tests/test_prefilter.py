@@ -0,0 +1,47 @@
+import os
+import sys
+import unittest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from utils.prefilter import PreFilter
+
+LONG = "I finally switched my whole home lab over to proxmox and it has been great so far"
+
+
+class TestPreFilter(unittest.TestCase):
+    def setUp(self):
+        self.prefilter = PreFilter(enabled=True, min_length=10, near_duplicate_threshold=0.8)
+
+    def test_screen(self):
+        self.assertIsNone(self.prefilter.screen(None, '[deleted]'))
+        self.assertIsNone(self.prefilter.screen(None, "Thanks! I am a bot, and this action was performed automatically."))
+        self.assertIsNone(self.prefilter.screen(None, '  ok   thx  '))
+        self.assertEqual(self.prefilter.screen('A perfectly fine title', ' [removed] '), ('A perfectly fine title', ''))
+        self.assertEqual(self.prefilter.screen(None, LONG), (None, LONG))
+
+        report = self.prefilter.report()
+        self.assertEqual(report['checked'], 5)
+        self.assertEqual(report['kept'], 2)
+        self.assertEqual(report['dropped']['deleted'], 1)
+        self.assertEqual(report['dropped']['bot'], 1)
+        self.assertEqual(report['dropped']['too_short'], 1)
+
+    def test_dedupe_keeps_first_occurrence(self):
+        texts = [LONG, LONG.upper(), LONG + ' lol', "Something else entirely, about cooking pasta at home"]
+        for text in texts:
+            self.prefilter.screen(None, text)
+        self.assertEqual(self.prefilter.dedupe(texts), [0, 3])
+        self.assertEqual(self.prefilter.report()['dropped']['duplicate'], 1)
+        self.assertEqual(self.prefilter.report()['dropped']['near_duplicate'], 1)
+
+    def test_disabled_keeps_everything(self):
+        prefilter = PreFilter(enabled=False, min_length=10)
+        self.assertEqual(prefilter.screen(None, '[deleted]'), (None, '[deleted]'))
+        self.assertEqual(prefilter.dedupe([LONG, LONG]), [0, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
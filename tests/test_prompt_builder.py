@@ -0,0 +1,41 @@
+import os
+import sys
+import unittest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from utils.prompt_builder import compact, estimate_tokens, fit_lines, squeeze
+
+
+class TestPromptBuilder(unittest.TestCase):
+    def test_compact(self):
+        stats = {
+            'ratio': 0.123456,
+            'frequency': float('inf'),
+            'hour_distribution': {hour: hour % 7 for hour in range(24)},
+            'sentiment': {f"s{i}": i / 3 for i in range(6)},
+            'top_subreddits': [('python', 3)],
+            'unused': 'x' * 100,
+        }
+        text = compact(stats, ['ratio', 'frequency', 'hour_distribution', 'sentiment', 'top_subreddits'])
+        self.assertEqual(
+            text,
+            '{"ratio":0.12,"frequency":null,"hour_distribution":{"6":6,"13":6,"20":6,"5":5,"12":5},'
+            '"sentiment":{"s0":0.0,"s1":0.33,"s2":0.67,"s3":1.0,"s4":1.33,"s5":1.67},"top_subreddits":[["python",3]]}'
+        )
+        self.assertEqual(compact(2241.40690897, digits=0), '2241')
+
+    def test_squeeze(self):
+        self.assertEqual(squeeze("\n        a:\n            b\n\n\n        c\n    "), "a:\nb\n\nc")
+
+    def test_fit_lines(self):
+        lines = ['x' * 38, 'y' * 400, 'z' * 10]
+        self.assertEqual(fit_lines(lines, 100), ['x' * 38, 'y' * 349 + '...'])
+        self.assertEqual(fit_lines(lines, 10), [])
+        self.assertLessEqual(sum(estimate_tokens(line) + 1 for line in fit_lines(lines, 100)), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
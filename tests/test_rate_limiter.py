@@ -0,0 +1,53 @@
+import os
+import sys
+import unittest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from src.rate_limiter import TokenBucketRateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucketRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = TokenBucketRateLimiter(rate=1.0, capacity=3, clock=self.clock, sleep=self.clock.sleep)
+
+    def test_burst_does_not_sleep(self):
+        for _ in range(3):
+            self.assertEqual(self.limiter.acquire(), 0.0)
+        self.assertEqual(self.clock.slept, [])
+
+    def test_paces_once_bucket_is_empty(self):
+        for _ in range(3):
+            self.limiter.acquire()
+        self.assertAlmostEqual(self.limiter.acquire(), 1.0)
+
+    def test_headers_take_over_budget(self):
+        self.limiter.update_from_headers({'x-ratelimit-remaining': '5', 'x-ratelimit-reset': '30'})
+        for _ in range(5):
+            self.assertEqual(self.limiter.acquire(), 0.0)
+        self.assertAlmostEqual(self.limiter.acquire(), 30.0)
+
+    def test_ignores_missing_headers(self):
+        self.limiter.update_from_headers({})
+        for _ in range(3):
+            self.assertEqual(self.limiter.acquire(), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+import config
+from src.reddit_scraper import RedditScraper, ScrapeCancelled
+from src.replay_backend import ReplayReddit, generate_synthetic_user, write_fixture
+
+
+class TestReplayBackend(unittest.TestCase):
+    def setUp(self):
+        self.fixtures = tempfile.mkdtemp()
+        write_fixture(self.fixtures, generate_synthetic_user('replay_user', posts=150, comments=250, seed=1))
+        self.reddit = ReplayReddit(self.fixtures)
+        self._saved = (config.CORPUS_CACHE_TTL, config.INCREMENTAL_SCRAPE)
+        config.CORPUS_CACHE_TTL, config.INCREMENTAL_SCRAPE = 0, False
+
+    def tearDown(self):
+        config.CORPUS_CACHE_TTL, config.INCREMENTAL_SCRAPE = self._saved
+
+    def test_pages_listings_like_reddit(self):
+        first = self.reddit.request(method='GET', path='/user/replay_user/comments', params={'limit': 100})
+        second = self.reddit.request(method='GET', path='/user/replay_user/comments',
+                                     params={'limit': 100, 'after': first['data']['after']})
+        self.assertEqual(len(first['data']['children']), 100)
+        self.assertNotEqual(first['data']['children'][0]['data']['id'], second['data']['children'][0]['data']['id'])
+
+    def test_scraper_runs_offline(self):
+        scraper = RedditScraper(reddit=self.reddit, backend='replay')
+        user_data = scraper.scrape_user_data('replay_user', use_cache=False)
+        self.assertEqual(len(user_data['posts']), min(150, config.MAX_POSTS))
+        self.assertEqual(len(user_data['comments']), min(250, config.MAX_COMMENTS))
+        self.assertEqual(user_data['posts'][0]['type'], 'post')
+
+    def test_concurrent_matches_sequential(self):
+        scraper = RedditScraper(reddit=self.reddit, backend='replay')
+        sequential = scraper.scrape_user_data('replay_user', concurrent=False, use_cache=False)
+        concurrent = scraper.scrape_user_data('replay_user', concurrent=True, use_cache=False)
+        for key in ('username', 'posts', 'comments'):
+            self.assertEqual(concurrent[key], sequential[key], key)
+        # account_age_days is measured from the time of each scrape
+        self.assertEqual(concurrent['user_info']['created_utc'], sequential['user_info']['created_utc'])
+
+    def test_cancelled_stream_stops_paging(self):
+        reddit = ReplayReddit(self.fixtures, latency=0.05)
+        stream = RedditScraper(reddit=reddit, backend='replay').stream_user_data('replay_user', use_cache=False)
+        next(iter(stream))
+        stream.cancel()
+
+        with self.assertRaises(ScrapeCancelled):
+            stream.result()
+        # about + the first posts page + at most one comments page, of 4 in a full scrape
+        self.assertLessEqual(reddit.request_count, 3)
+
+    def test_rate_limit_settings_reach_the_backend(self):
+        with mock.patch('config.REPLAY_FIXTURES_DIR', self.fixtures), \
+                mock.patch('config.REPLAY_RATE_LIMIT', 60), mock.patch('config.REPLAY_RATE_WINDOW', 30.0):
+            reddit = RedditScraper(backend='replay').reddit
+        self.assertEqual((reddit.rate_limit, reddit.rate_window), (60, 30.0))
+
+    def test_unknown_user_fails_after_one_request(self):
+        scraper = RedditScraper(reddit=self.reddit, backend='replay')
+        with self.assertRaises(ValueError):
+            scraper.scrape_user_data('nobody_here', use_cache=False)
+        self.assertEqual(self.reddit.request_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import sys
+import tempfile
+import unittest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from src.reddit_scraper import RedditScraper
+from src.scrape_store import ScrapeStore, merge_items
+
+
+def _item(item_id, created_utc, text=''):
+    return {'id': item_id, 'created_utc': created_utc, 'text': text}
+
+
+class TestScrapeStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ScrapeStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_unseen_user_is_empty(self):
+        stored = self.store.load('nobody')
+        self.assertEqual(stored['posts'], [])
+        self.assertEqual(stored['comment_ids'], set())
+        self.assertEqual(stored['newest_post_utc'], 0)
+
+    def test_round_trip(self):
+        posts = [_item('p2', 200), _item('p1', 100)]
+        comments = [_item('c1', 150, 'hello')]
+        self.store.save('Some.User', posts, comments)
+
+        stored = self.store.load('some.user')
+        self.assertEqual(stored['posts'], posts)
+        self.assertEqual(stored['comments'], comments)
+        self.assertEqual(stored['post_ids'], {'p1', 'p2'})
+        self.assertEqual(stored['newest_post_utc'], 200)
+        self.assertEqual(stored['newest_comment_utc'], 150)
+        self.assertEqual([name for name in os.listdir(self.tmp.name)], ['some_user.json'])
+
+    def test_unreadable_store_is_ignored(self):
+        with open(os.path.join(self.tmp.name, 'broken.json'), 'w') as f:
+            f.write('{not json')
+        self.assertEqual(self.store.load('broken')['posts'], [])
+
+
+class TestMergeItems(unittest.TestCase):
+    def test_newest_first_and_capped(self):
+        merged = merge_items([_item('c', 300), _item('b', 200)], [_item('a', 100), _item('d', 250)], limit=3)
+        self.assertEqual([item['id'] for item in merged], ['c', 'd', 'b'])
+
+    def test_dedup_keeps_fresh_copy(self):
+        merged = merge_items([_item('a', 100, 'edited')], [_item('a', 100, 'original'), _item('b', 50)], limit=10)
+        self.assertEqual([(item['id'], item['text']) for item in merged], [('a', 'edited'), ('b', '')])
+
+
+class TestReachedKnown(unittest.TestCase):
+    def test_stops_at_known_or_older_items(self):
+        reached = RedditScraper._reached_known
+        self.assertTrue(reached(_item('a', 500), False, {'a'}, 100))
+        self.assertTrue(reached(_item('z', 50), False, {'a'}, 100))
+        self.assertFalse(reached(_item('z', 150), False, {'a'}, 100))
+
+    def test_stickied_items_do_not_stop_the_listing(self):
+        self.assertFalse(RedditScraper._reached_known(_item('a', 50), True, {'a'}, 100))
+
+    def test_nothing_stored(self):
+        self.assertFalse(RedditScraper._reached_known(_item('a', 50), False, set(), 0))
+        self.assertFalse(RedditScraper._reached_known(_item('a', 50), False, None, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
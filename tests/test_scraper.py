@@ -1,17 +1,38 @@
 import os
 import sys
+import threading
 import unittest
 
 _ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if _ROOT not in sys.path:
     sys.path.insert(0, _ROOT)
 
-from src.reddit_scraper import RedditScraper
+from src.reddit_scraper import RedditScraper, get_reddit_client
+
+
+def _in_thread(fn):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(fn()))
+    thread.start()
+    thread.join()
+    return result[0]
+
 
 class TestRedditScraper(unittest.TestCase):
     def test_initialization(self):
         scraper = RedditScraper()
         self.assertIsNotNone(scraper.reddit)
 
+    def test_each_thread_gets_its_own_client(self):
+        self.assertIs(get_reddit_client(), get_reddit_client())
+        self.assertIsNot(_in_thread(get_reddit_client), get_reddit_client())
+
+    def test_scraper_uses_the_calling_threads_client(self):
+        scraper = RedditScraper(backend='praw')
+        self.assertIs(scraper.reddit, get_reddit_client())
+        worker_client = _in_thread(lambda: (scraper.reddit, get_reddit_client()))
+        self.assertIs(worker_client[0], worker_client[1])
+        self.assertIsNot(worker_client[0], scraper.reddit)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,39 @@
+import os
+import sys
+import unittest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from textblob import TextBlob
+
+from src.sentiment_engine import SentimentEngine
+
+
+class TestSentimentEngine(unittest.TestCase):
+    def test_matches_textblob(self):
+        engine = SentimentEngine()
+        text = "I really love this library, but the docs are terrible."
+        blob = TextBlob(text).sentiment
+        result = engine.score(text)
+        self.assertAlmostEqual(result['textblob_polarity'], blob.polarity)
+        self.assertAlmostEqual(result['textblob_subjectivity'], blob.subjectivity)
+
+    def test_batch_scores_duplicates_once(self):
+        engine = SentimentEngine()
+        results = engine.score_batch(["great post", "awful post", "great post"])
+        self.assertEqual(results[0], results[2])
+        self.assertEqual(engine.stats()['vader_calls'], 2)
+
+        engine.score("awful post")
+        self.assertEqual(engine.stats()['cache_hits'], 1)
+
+    def test_cache_is_bounded(self):
+        engine = SentimentEngine(cache_size=2)
+        engine.score_batch(["one", "two", "three"])
+        self.assertEqual(engine.stats()['cache_size'], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
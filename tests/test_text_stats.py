@@ -0,0 +1,42 @@
+import os
+import re
+import sys
+import unittest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from utils.text_stats import TextStats
+
+TEXTS = ["Is this GOOD?! Yes... it is.", "", "no punctuation here", "Wow!!! Really? OK."]
+
+
+class TestTextStats(unittest.TestCase):
+    def test_matches_whole_corpus_counts(self):
+        joined = ''.join(TEXTS)
+        stats = TextStats()
+        for text in TEXTS:
+            stats.add(text)
+
+        self.assertEqual(stats.texts, 4)
+        self.assertEqual(stats.chars, len(joined))
+        self.assertEqual(stats.words, sum(len(text.split()) for text in TEXTS))
+        self.assertEqual(stats.sentences, len(re.findall(r'[.!?]+', joined)))
+        self.assertEqual(stats.questions, joined.count('?'))
+        self.assertEqual(stats.caps, sum(1 for c in joined if c.isupper()))
+
+    def test_merge_is_order_independent(self):
+        left = TextStats.of(TEXTS[0]) + TextStats.of(TEXTS[3])
+        right = TextStats.of(TEXTS[3]).merge(TextStats.of(TEXTS[0]))
+        self.assertEqual(left, right)
+
+    def test_features(self):
+        features = TextStats.of("Why? Why not!").features()
+        self.assertEqual(features['sentence_count'], 2)
+        self.assertEqual(features['question_ratio'], 0.5)
+        self.assertEqual(TextStats().features()['caps_ratio'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
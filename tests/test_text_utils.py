@@ -0,0 +1,103 @@
+import os
+import re
+import sys
+import time
+import unittest
+from unittest import mock
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+import nltk
+
+from utils.text_utils import TextAnalysis, calculate_readability, clean_text, clean_texts, count_syllables
+
+
+def _has_nltk_data():
+    try:
+        nltk.data.find('tokenizers/punkt_tab')
+        nltk.data.find('corpora/stopwords')
+        return True
+    except LookupError:
+        return False
+
+
+def _reference_clean(text):
+    """The original five-pass regex cleaner"""
+    if not text:
+        return ""
+    text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+    text = re.sub(r'/u/\w+', '', text)
+    text = re.sub(r'/r/\w+', '', text)
+    text = re.sub(r'\[.*?\]\(.*?\)', '', text)
+    text = re.sub(r'&gt;.*', '', text)
+    return ' '.join(text.split()).strip()
+
+
+SAMPLES = [
+    "",
+    "Check https://example.com/a?b=c%20d and http://x.y/(z) now",
+    "Thanks /u/someone, see /r/python for more",
+    "A [link](http://a.b) and [another] (not a link) [x](y",
+    "[a [b](c) d](e) trailing",
+    "first line\n&gt; quoted reply\nlast [x](\ny)",
+    "  lots   of\t\twhitespace \n\n here ",
+    "[[[[](()))]]",
+]
+
+
+class TestCleanText(unittest.TestCase):
+    def test_matches_reference(self):
+        for text in SAMPLES:
+            self.assertEqual(clean_text(text), _reference_clean(text), text)
+
+    def test_batch_matches_single(self):
+        self.assertEqual(clean_texts(SAMPLES + [None]), [clean_text(t) for t in SAMPLES] + [""])
+        self.assertEqual(clean_texts([]), [])
+        self.assertEqual(clean_texts(["a\x00b [x](y)"]), ["a\x00b"])
+
+    def test_bracket_heavy_input_is_linear(self):
+        text = '[' * 200000 + '](' + '\n' + '[x(' * 50000
+        start = time.perf_counter()
+        clean_text(text)
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+
+class TestTextAnalysis(unittest.TestCase):
+    def test_count_syllables(self):
+        self.assertEqual(count_syllables('cat'), 1)
+        self.assertGreaterEqual(count_syllables('readability'), 4)
+
+    def test_readability_known_values(self):
+        # 206.835 - 1.015 * words/sentences - 84.6 * syllables/words, by hand
+        self.assertEqual(calculate_readability("The cat sat on the mat."), 116.15)
+        self.assertEqual(calculate_readability("The dog ran home. The cat sat on the mat."), 117.16)
+        self.assertEqual(calculate_readability("Programming is wonderful."), 6.39)
+        self.assertEqual(calculate_readability(""), 0.0)
+
+    def test_sentences_keep_case_and_tokens_are_lowercased(self):
+        analysis = TextAnalysis("Hello World. Bye now!")
+        self.assertEqual(analysis.sentences, ["Hello World.", "Bye now!"])
+        self.assertEqual(analysis.words, ['hello', 'world', 'bye', 'now'])
+
+    def test_missing_punkt_falls_back_to_punctuation_split(self):
+        text = "The dog ran home. The cat sat on the mat."
+        with mock.patch('utils.text_utils.sent_tokenize', side_effect=LookupError):
+            analysis = TextAnalysis(text)
+            self.assertEqual(analysis.sentence_count, 2)
+            self.assertEqual(analysis.readability, 117.16)
+        with mock.patch('utils.text_utils.TextAnalysis', side_effect=RuntimeError):
+            self.assertEqual(calculate_readability(text), 0.0)
+
+    @unittest.skipUnless(_has_nltk_data(), 'NLTK punkt/stopwords data not installed')
+    def test_features_share_one_tokenization(self):
+        analysis = TextAnalysis("The cat sat on the mat. Cats don't like mats, cats like laps!")
+        self.assertEqual(analysis.sentence_count, 2)
+        self.assertEqual(analysis.word_count, 13)
+        self.assertEqual(analysis.keywords(2), ['cats', 'like'])
+        self.assertGreater(analysis.readability, 80)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import sys
+import unittest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from config import TOPIC_TAXONOMY_PATH
+from utils.topic_matcher import TopicMatcher, load_taxonomy
+
+
+class TestTopicMatcher(unittest.TestCase):
+    def setUp(self):
+        self.matcher = TopicMatcher({
+            'technology': ['app', 'pc', 'program*', 'machine learning'],
+            'education': ['learning', 'school'],
+            'gaming': ['game', 'pc'],
+        })
+
+    def test_word_boundaries(self):
+        self.assertEqual(self.matcher.count("So happy with my pcs"), {})
+        self.assertEqual(self.matcher.count("New PC, new app!"), {'technology': 2, 'gaming': 1})
+
+    def test_prefixes_and_phrases(self):
+        hits = self.matcher.count("Programmers love machine learning; school is learning too")
+        self.assertEqual(hits, {'technology': 2, 'education': 3})
+
+    def test_overlapping_phrase_via_failure_link(self):
+        matcher = TopicMatcher({'a': ['big data pipeline'], 'b': ['data pipeline'], 'c': ['big data']})
+        self.assertEqual(matcher.count("big big data pipeline"), {'a': 1, 'b': 1, 'c': 1})
+
+    def test_topic_counts_once_per_word(self):
+        matcher = TopicMatcher({'politics': ['political', 'politic*'], 'health': ['health', 'mental health']})
+        self.assertEqual(matcher.count("political"), {'politics': 1})
+        self.assertEqual(matcher.count("mental health and health"), {'health': 2})
+
+    def test_scan_totals_and_per_item(self):
+        totals, per_item = self.matcher.scan(["a game", "", "school app"])
+        self.assertEqual(totals, {'technology': 1, 'education': 1, 'gaming': 1})
+        self.assertEqual(per_item, [{'gaming': 1}, {}, {'technology': 1, 'education': 1}])
+
+    def test_shipped_taxonomy_loads(self):
+        taxonomy = load_taxonomy(TOPIC_TAXONOMY_PATH)
+        self.assertIn('technology', taxonomy)
+        matcher = TopicMatcher(taxonomy)
+        self.assertTrue(matcher.count("I write python code"))
+        for text, topic in [('political', 'politics'), ('mental health', 'health'),
+                            ('road trip', 'travel'), ('electric vehicle', 'automotive')]:
+            self.assertEqual(matcher.count(text).get(topic), 1, text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,265 @@
+"""
+Keyword Profile Module
+Corpus-level TF-IDF keywords scored against a background IDF table
+
+The table is a sorted structured .npy array of (term, idf) records, opened
+memory-mapped and searched with np.searchsorted, so loading it costs no
+parsing and lookups are one vectorized call per user.
+
+Rebuild it with:
+    python -m utils.keyword_profile --frequencies WORD_COUNTS.txt data/background_idf.npy
+    python -m utils.keyword_profile --documents ONE_DOC_PER_LINE.txt data/background_idf.npy
+"""
+
+import argparse
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+_TERM_RE = re.compile(r'[a-z][a-z0-9]{2,}')
+_MAX_TERM_BYTES = 24
+IDF_DTYPE = np.dtype([('term', f'S{_MAX_TERM_BYTES}'), ('idf', '<f4')])
+
+# Tokens per document assumed when turning corpus word frequencies into
+# document frequencies (about one Reddit comment)
+_DOCUMENT_TOKENS = 40
+
+# Internet and Reddit vocabulary that general-English tables miss or rate
+# as rare; it says nothing about a user's interests, so it never scores
+INTERNET_STOPWORDS = frozenset({
+    'lol', 'lmao', 'lmfao', 'rofl', 'haha', 'hahaha', 'omg', 'wtf', 'tbh', 'imo', 'imho', 'btw',
+    'idk', 'irl', 'afaik', 'iirc', 'fwiw', 'smh', 'ngl', 'fyi', 'tldr', 'eli5', 'til', 'ama', 'nsfw',
+    'gonna', 'wanna', 'gotta', 'kinda', 'sorta', 'dunno', 'yeah', 'yep', 'nope', 'yup', 'okay',
+    'guys', 'dude', 'bro', 'thx', 'pls', 'plz', 'reddit', 'redditor', 'redditors', 'subreddit',
+    'subreddits', 'upvote', 'upvotes', 'upvoted', 'downvote', 'downvotes', 'downvoted', 'karma',
+    'mods', 'repost', 'crosspost', 'edit', 'edited', 'deleted', 'removed', 'http', 'https',
+    'www', 'com', 'imgur', 'youtube', 'youtu', 'amp', 'gif', 'meme', 'memes', 'literally',
+    'honestly', 'basically', 'actually', 'stuff', 'thing', 'things',
+})
+
+# Contractions typed without the apostrophe; the spelling-list table does not
+# know them, so they would get the unknown-term IDF
+APOSTROPHELESS_CONTRACTIONS = frozenset({
+    'dont', 'cant', 'wont', 'thats', 'didnt', 'doesnt', 'isnt', 'wasnt', 'arent', 'werent',
+    'havent', 'hasnt', 'hadnt', 'couldnt', 'wouldnt', 'shouldnt', 'mustnt', 'aint', 'ive',
+    'youre', 'youve', 'youll', 'youd', 'theyre', 'theyve', 'theyll', 'theyd', 'weve', 'hes',
+    'shes', 'whats', 'whos', 'wheres', 'theres', 'heres', 'thered', 'yall',
+})
+
+# Scores below this are function words the IDF table already rates as common
+MIN_SCORE = 2.0
+
+
+def terms(text: str) -> List[str]:
+    """Lowercase alphanumeric terms of 3+ characters, starting with a letter"""
+    return _TERM_RE.findall(text.lower())
+
+
+class BackgroundIDF:
+    """Read-only, memory-mapped term -> IDF table"""
+
+    def __init__(self, path: str):
+        self.table = np.load(path, mmap_mode='r')
+        if self.table.dtype != IDF_DTYPE:
+            raise ValueError(f"Background IDF table {path} has dtype {self.table.dtype}, expected {IDF_DTYPE}")
+        self._terms = self.table['term']
+        # Terms missing from the background are mostly slang, names and
+        # typos as often as rare topical words; rate them as a typical term
+        self.unknown_idf = float(np.median(self.table['idf'])) if len(self.table) else 1.0
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def lookup(self, words: Sequence[str]) -> np.ndarray:
+        """IDF of each word, unknown_idf where the table has no entry"""
+        if not len(self) or not words:
+            return np.full(len(words), self.unknown_idf, dtype=np.float64)
+
+        keys = np.array([word.encode('utf-8') for word in words], dtype=object)
+        fits = np.fromiter((len(key) <= _MAX_TERM_BYTES for key in keys), dtype=bool, count=len(keys))
+        keys = keys.astype(self._terms.dtype)
+
+        positions = np.minimum(np.searchsorted(self._terms, keys), len(self) - 1)
+        found = fits & (self._terms[positions] == keys)
+        return np.where(found, self.table['idf'][positions], self.unknown_idf).astype(np.float64)
+
+
+class TermMatrix:
+    """
+    Sparse item x term count matrix in CSR form, built in one pass
+
+    Row i holds the terms of texts[i]: columns indices[indptr[i]:indptr[i+1]]
+    with counts counts[indptr[i]:indptr[i+1]]; vocabulary[column] is the term.
+    """
+
+    def __init__(self, texts: Iterable[str]):
+        self.vocabulary: List[str] = []
+        column_of: Dict[str, int] = {}
+        indptr, indices, counts = [0], [], []
+
+        for text in texts:
+            for term, count in Counter(terms(text)).items():
+                column = column_of.get(term)
+                if column is None:
+                    column = column_of[term] = len(self.vocabulary)
+                    self.vocabulary.append(term)
+                indices.append(column)
+                counts.append(count)
+            indptr.append(len(indices))
+
+        self.indptr = np.array(indptr, dtype=np.int64)
+        self.indices = np.array(indices, dtype=np.int64)
+        self.counts = np.array(counts, dtype=np.int64)
+
+    @property
+    def rows(self) -> int:
+        return len(self.indptr) - 1
+
+    def term_counts(self) -> np.ndarray:
+        """Occurrences of each term over all rows"""
+        return np.bincount(self.indices, weights=self.counts, minlength=len(self.vocabulary)).astype(np.int64)
+
+    def document_frequency(self) -> np.ndarray:
+        """Rows each term occurs in"""
+        return np.bincount(self.indices, minlength=len(self.vocabulary))
+
+    def rows_with(self, column: int, limit: int) -> List[int]:
+        """First `limit` rows containing a term"""
+        entries = np.flatnonzero(self.indices == column)[:limit]
+        return (np.searchsorted(self.indptr, entries, side='right') - 1).tolist()
+
+
+def _excluded_terms() -> frozenset:
+    """Terms never reported: English stopwords, internet words and bare contractions"""
+    from utils.text_utils import get_stop_words
+
+    try:
+        stop_words = get_stop_words()
+    except LookupError:
+        # Without the NLTK corpus, MIN_SCORE still drops the commonest function words
+        stop_words = frozenset()
+    return stop_words | INTERNET_STOPWORDS | APOSTROPHELESS_CONTRACTIONS
+
+
+def distinctive_terms(matrix: TermMatrix, background: BackgroundIDF, top_n: int = 25,
+                      sources: int = 3, min_score: float = MIN_SCORE) -> List[Dict]:
+    """
+    The user's most distinctive terms: sublinear term frequency x background IDF
+
+    Terms must occur in at least two items (when there are two), so a typo or
+    one long post does not dominate the profile. Stopwords, INTERNET_STOPWORDS
+    and APOSTROPHELESS_CONTRACTIONS are skipped, as is anything scoring below
+    `min_score`.
+
+    Returns:
+        [{'term', 'score', 'count', 'items', 'rows'}] by descending score;
+        'rows' are the first matrix rows using the term, for citations
+    """
+    if not matrix.vocabulary:
+        return []
+
+    counts = matrix.term_counts()
+    items = matrix.document_frequency()
+    scores = (1 + np.log(counts)) * background.lookup(matrix.vocabulary)
+    scores[items < min(2, matrix.rows)] = 0
+    excluded = _excluded_terms()
+    scores[[column for column, term in enumerate(matrix.vocabulary) if term in excluded]] = 0
+
+    keep = np.flatnonzero((scores > 0) & (scores >= min_score))
+    top = keep[np.lexsort((keep, -scores[keep]))][:top_n]
+    return [
+        {
+            'term': matrix.vocabulary[column],
+            'score': round(float(scores[column]), 3),
+            'count': int(counts[column]),
+            'items': int(items[column]),
+            'rows': matrix.rows_with(column, sources)
+        }
+        for column in top
+    ]
+
+
+_shared_background: Optional[BackgroundIDF] = None
+_shared_lock = threading.Lock()
+
+
+def get_background_idf() -> BackgroundIDF:
+    """Return the configured background table, mapped once per process"""
+    global _shared_background
+    with _shared_lock:
+        if _shared_background is None:
+            from config import BACKGROUND_IDF_PATH
+
+            _shared_background = BackgroundIDF(BACKGROUND_IDF_PATH)
+        return _shared_background
+
+
+def build_background_idf(idf: Dict[str, float], path: str):
+    """Write a term -> IDF mapping as a sorted table BackgroundIDF can map"""
+    entries = sorted(
+        (term.encode('utf-8'), value) for term, value in idf.items()
+        if len(term.encode('utf-8')) <= _MAX_TERM_BYTES
+    )
+    table = np.array(entries, dtype=IDF_DTYPE)
+    with open(path, 'wb') as f:
+        np.save(f, table)
+
+
+def idf_from_documents(documents: Iterable[str]) -> Dict[str, float]:
+    """log(N / df) over a document sample"""
+    total = 0
+    df = Counter()
+    for document in documents:
+        total += 1
+        df.update(set(terms(document)))
+    return {term: math.log(total / count) for term, count in df.items()}
+
+
+def idf_from_frequencies(frequencies: Dict[str, int]) -> Dict[str, float]:
+    """
+    IDF estimated from corpus word counts
+
+    A word with relative frequency f appears in a document of L tokens with
+    probability 1 - (1 - f)^L; the IDF is minus the log of that.
+    """
+    total = sum(frequencies.values())
+    return {
+        word: -math.log(-math.expm1(_DOCUMENT_TOKENS * math.log1p(-count / total)))
+        for word, count in frequencies.items()
+        if _TERM_RE.fullmatch(word)
+    }
+
+
+def _read_frequencies(path: str) -> Dict[str, int]:
+    frequencies = Counter()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 2 and not line.startswith(';') and parts[1].isdigit():
+                frequencies[parts[0].lower()] += int(parts[1])
+    return frequencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the background IDF table used for keyword profiles')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--frequencies', help='"word count" lines (";" comment lines are skipped)')
+    source.add_argument('--documents', help='One document per line, e.g. a sample of Reddit comments')
+    parser.add_argument('output', help='Output .npy path')
+    args = parser.parse_args()
+
+    if args.frequencies:
+        idf = idf_from_frequencies(_read_frequencies(args.frequencies))
+    else:
+        with open(args.documents, 'r', encoding='utf-8') as f:
+            idf = idf_from_documents(f)
+    build_background_idf(idf, args.output)
+    print(f"Wrote {len(idf)} terms to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
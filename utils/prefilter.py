@@ -0,0 +1,164 @@
+"""
+Pre-filter Module
+Cheap screening of raw posts/comments before cleaning and NLP
+"""
+
+import hashlib
+import re
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+DROP_REASONS = ('deleted', 'bot', 'too_short', 'duplicate', 'near_duplicate')
+
+_REMOVED_MARKERS = frozenset({'[deleted]', '[removed]'})
+_BOT_RE = re.compile(r"\bI(?:'m| am) a bot\b|this action was performed automatically", re.IGNORECASE)
+
+# MinHash over word 3-shingles; 8 bands of 8 rows put the LSH candidate
+# threshold near 0.77 Jaccard, below the default near-duplicate cut-off
+_SHINGLE_WORDS = 3
+_NEAR_DUPLICATE_MIN_WORDS = 8
+_NUM_PERM = 64
+_BANDS = 8
+_ROWS = _NUM_PERM // _BANDS
+_PRIME = np.uint64(4294967311)
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 1 << 31, size=(_NUM_PERM, 1)).astype(np.uint64)
+_PERM_B = _rng.randint(0, 1 << 31, size=(_NUM_PERM, 1)).astype(np.uint64)
+
+
+def _normalize(text: str) -> str:
+    return ' '.join(text.lower().split())
+
+
+def _minhash(words: List[str]) -> np.ndarray:
+    shingles = {' '.join(words[i:i + _SHINGLE_WORDS]) for i in range(len(words) - _SHINGLE_WORDS + 1)}
+    # crc32 rather than hash(): stable across processes and PYTHONHASHSEED
+    hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+    return ((_PERM_A * hashes + _PERM_B) % _PRIME).min(axis=1)
+
+
+class _NearDuplicateIndex:
+    """MinHash LSH index of kept texts"""
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.signatures: List[np.ndarray] = []
+        self.buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(_BANDS)]
+
+    def add_unless_similar(self, words: List[str]) -> bool:
+        """Index the text and return True, or return False if a kept text is similar"""
+        signature = _minhash(words)
+        keys = [signature[band * _ROWS:(band + 1) * _ROWS].tobytes() for band in range(_BANDS)]
+
+        candidates = set()
+        for buckets, key in zip(self.buckets, keys):
+            candidates.update(buckets.get(key, ()))
+        for candidate in candidates:
+            if np.mean(self.signatures[candidate] == signature) >= self.threshold:
+                return False
+
+        index = len(self.signatures)
+        self.signatures.append(signature)
+        for buckets, key in zip(self.buckets, keys):
+            buckets.setdefault(key, []).append(index)
+        return True
+
+
+class PreFilter:
+    """
+    Drops low-value raw items of one listing before they are cleaned and scored
+
+    screen() handles the per-item checks: deleted/removed bodies, bot
+    boilerplate and texts too short to survive cleaning (cleaning only
+    removes characters, so the length test never drops an item that
+    processing would have kept). dedupe() then drops exact duplicates
+    (case/whitespace-insensitive) and MinHash near-duplicates, keeping the
+    first occurrence. Drop counts per reason are kept for report().
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, min_length: Optional[int] = None,
+                 near_duplicate_threshold: Optional[float] = None):
+        from config import MIN_TEXT_LENGTH, NEAR_DUPLICATE_THRESHOLD, PREFILTER_ENABLED
+
+        self.enabled = PREFILTER_ENABLED if enabled is None else enabled
+        self.min_length = MIN_TEXT_LENGTH if min_length is None else min_length
+        self.near_duplicate_threshold = (
+            NEAR_DUPLICATE_THRESHOLD if near_duplicate_threshold is None else near_duplicate_threshold
+        )
+        self.checked = 0
+        self.dropped = Counter()
+
+    @staticmethod
+    def body(text: Optional[str]) -> str:
+        """The raw body with deleted/removed markers blanked"""
+        text = text or ''
+        return '' if text.strip() in _REMOVED_MARKERS else text
+
+    @staticmethod
+    def key(title: Optional[str], text: str) -> str:
+        """The text duplicates are detected on"""
+        return text if title is None else f"{title}\n{text}"
+
+    def screen(self, title: Optional[str], text: Optional[str]) -> Optional[Tuple[Optional[str], str]]:
+        """
+        Per-item checks for one post (title given) or comment (title None)
+
+        Returns:
+            (title, text) to process, with a deleted post body blanked so the
+            title still counts, or None if the item is dropped
+        """
+        self.checked += 1
+        if not self.enabled:
+            return title, text or ''
+
+        body = self.body(text)
+        if not body and (text or '').strip() and not (title or '').strip():
+            return self._drop('deleted')
+        if _BOT_RE.search(body):
+            return self._drop('bot')
+
+        length = len(' '.join(body.split()))
+        if title is not None:
+            length += 1 + len(' '.join(title.split()))
+        if length < self.min_length:
+            return self._drop('too_short')
+        return title, body
+
+    def dedupe(self, keys: List[str]) -> List[int]:
+        """Indexes of the screened items (by key()) that are not duplicates of an earlier one"""
+        if not self.enabled:
+            return list(range(len(keys)))
+
+        seen = set()
+        near = _NearDuplicateIndex(self.near_duplicate_threshold)
+        kept = []
+        for i, key in enumerate(keys):
+            normalized = _normalize(key)
+            digest = hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).digest()
+            if digest in seen:
+                self._drop('duplicate')
+                continue
+            seen.add(digest)
+
+            words = normalized.split()
+            if len(words) >= _NEAR_DUPLICATE_MIN_WORDS and not near.add_unless_similar(words):
+                self._drop('near_duplicate')
+                continue
+            kept.append(i)
+        return kept
+
+    def _drop(self, reason: str) -> None:
+        self.dropped[reason] += 1
+        return None
+
+    def report(self) -> Dict:
+        """Items checked, kept and dropped per reason"""
+        dropped = {reason: self.dropped[reason] for reason in DROP_REASONS}
+        return {
+            'checked': self.checked,
+            'kept': self.checked - sum(dropped.values()),
+            'dropped': dropped
+        }
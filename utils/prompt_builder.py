@@ -0,0 +1,83 @@
+"""
+Prompt Builder Module
+Compact serialization of persona statistics and token budgeting for LLM prompts
+"""
+
+import json
+import math
+import numbers
+from typing import Any, Iterable, List, Optional
+
+# Count mappings longer than this (hour/day distributions, topic scores)
+# are cut to their largest nonzero entries
+MAX_MAPPING_ITEMS = 5
+
+# English text averages about four characters per token in BPE vocabularies
+_CHARS_PER_TOKEN = 4
+
+
+def squeeze(prompt: str) -> str:
+    """Drop line indentation and repeated blank lines, which cost tokens but carry nothing"""
+    lines, blank = [], False
+    for line in prompt.strip().splitlines():
+        line = line.strip()
+        if line or not blank:
+            lines.append(line)
+        blank = not line
+    return '\n'.join(lines)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate prompt tokens for `text`, without loading a tokenizer"""
+    return -(-len(text) // _CHARS_PER_TOKEN)
+
+
+def _compact_value(value: Any, digits: int) -> Any:
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, numbers.Real):
+        value = float(value)
+        if not math.isfinite(value):
+            return None
+        return round(value, digits) if digits else int(round(value))
+    if isinstance(value, dict):
+        if len(value) > MAX_MAPPING_ITEMS and all(
+            isinstance(v, numbers.Integral) and not isinstance(v, bool) for v in value.values()
+        ):
+            top = sorted(value.items(), key=lambda item: item[1], reverse=True)[:MAX_MAPPING_ITEMS]
+            value = {key: count for key, count in top if count}
+        return {str(key): _compact_value(v, digits) for key, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_compact_value(v, digits) for v in value]
+    return str(value)
+
+
+def compact(value: Any, keys: Optional[Iterable[str]] = None, digits: int = 2) -> str:
+    """
+    Minified JSON for a statistic or a dict of statistics
+
+    Keeps only `keys` (when given), rounds floats to `digits`, maps
+    non-finite numbers to null and summarizes long numeric mappings to their
+    top MAX_MAPPING_ITEMS entries (count mappings only).
+    """
+    if keys is not None:
+        value = {key: value[key] for key in keys if key in value}
+    return json.dumps(_compact_value(value, digits), separators=(',', ':'), ensure_ascii=False)
+
+
+def fit_lines(lines: List[str], budget: int) -> List[str]:
+    """Leading lines that fit in `budget` tokens; the first that does not is cut short"""
+    kept = []
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if cost <= budget:
+            kept.append(line)
+            budget -= cost
+            continue
+        chars = (budget - 1) * _CHARS_PER_TOKEN - 3
+        if chars >= 40:
+            kept.append(line[:chars] + '...')
+        break
+    return kept
@@ -0,0 +1,77 @@
+"""
+Text Stats Module
+Mergeable running counts behind the corpus-level text features
+"""
+
+import re
+from typing import Dict
+
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+
+
+class TextStats:
+    """
+    Word, sentence, punctuation and capital-letter counts over many texts
+
+    Counts are additive, so per-item stats can be added one at a time as
+    items arrive, summed from stored columns, or merged across listings
+    without ever joining the texts into one string.
+    """
+
+    __slots__ = ('texts', 'chars', 'words', 'sentences', 'questions', 'exclamations', 'caps')
+
+    def __init__(self, texts: int = 0, chars: int = 0, words: int = 0, sentences: int = 0,
+                 questions: int = 0, exclamations: int = 0, caps: int = 0):
+        self.texts = texts
+        self.chars = chars
+        self.words = words
+        self.sentences = sentences
+        self.questions = questions
+        self.exclamations = exclamations
+        self.caps = caps
+
+    @classmethod
+    def of(cls, text: str) -> 'TextStats':
+        """Counts for a single text"""
+        return cls(
+            texts=1,
+            chars=len(text),
+            words=len(text.split()),
+            sentences=len(_SENTENCE_END_RE.findall(text)),
+            questions=text.count('?'),
+            exclamations=text.count('!'),
+            caps=sum(map(str.isupper, text))
+        )
+
+    def add(self, text: str) -> 'TextStats':
+        """Fold one more text in place"""
+        return self.merge(TextStats.of(text))
+
+    def merge(self, other: 'TextStats') -> 'TextStats':
+        """Fold another accumulator in place"""
+        for field in self.__slots__:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+        return self
+
+    def __add__(self, other: 'TextStats') -> 'TextStats':
+        return TextStats().merge(self).merge(other)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TextStats):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{field}={getattr(self, field)}" for field in self.__slots__)
+        return f"TextStats({fields})"
+
+    def features(self) -> Dict:
+        """Text statistics and linguistic ratios, as DataProcessor reports them"""
+        return {
+            'word_count': self.words,
+            'char_count': self.chars,
+            'sentence_count': self.sentences,
+            'question_ratio': self.questions / self.sentences if self.sentences > 0 else 0,
+            'exclamation_ratio': self.exclamations / self.sentences if self.sentences > 0 else 0,
+            'caps_ratio': self.caps / self.chars if self.chars else 0
+        }
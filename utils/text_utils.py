@@ -1,10 +1,12 @@
 
 import re
+from collections import Counter
+from functools import lru_cache
+
 import nltk
+import pyphen
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
-from textstat import flesch_reading_ease
-from collections import Counter
+from nltk.tokenize import NLTKWordTokenizer, sent_tokenize
 
 # Download required NLTK data
 try:
@@ -14,47 +16,198 @@ except LookupError:
     nltk.download('punkt', quiet=True)
     nltk.download('stopwords', quiet=True)
 
+# Precompiled cleaning patterns, applied in this order by clean_text
+# (the URL class is the original alternation collapsed into one character set)
+_URL_RE = re.compile(r'http[s]?://[!$-_a-z]+')
+_USER_RE = re.compile(r'/u/\w+')
+_SUBREDDIT_RE = re.compile(r'/r/\w+')
+_QUOTE_RE = re.compile(r'&gt;.*')
+
+# Joins a listing into one string for clean_texts; no pattern can match across it
+_BATCH_SEPARATOR = '\n\x00\n'
+
+
+def _strip_markdown_links(text: str) -> str:
+    """
+    Remove ``[label](target)`` links with the semantics of ``\\[.*?\\]\\(.*?\\)``
+
+    A scanner instead of the regex, which rescans the rest of the line for
+    every unmatched ``[`` and goes quadratic on bracket-heavy comments.
+    """
+    if '](' not in text:
+        return text
+
+    parts = []
+    last = pos = 0
+    eol = -1
+    length = len(text)
+    while True:
+        start = text.find('[', pos)
+        if start == -1:
+            break
+        if start > eol:
+            eol = text.find('\n', start)
+            if eol == -1:
+                eol = length
+
+        # If this '[' has no match, no later '[' on the same line can have one
+        middle = text.find('](', start + 1, eol)
+        end = text.find(')', middle + 2, eol) if middle != -1 else -1
+        if end == -1:
+            if eol == length:
+                break
+            pos = eol + 1
+            continue
+
+        parts.append(text[last:start])
+        last = pos = end + 1
+
+    if not parts:
+        return text
+    parts.append(text[last:])
+    return ''.join(parts)
+
+
+def _strip_markup(text: str) -> str:
+    """Every removal pass of clean_text, without the whitespace normalisation"""
+    text = _URL_RE.sub('', text)
+    text = _USER_RE.sub('', text)
+    text = _SUBREDDIT_RE.sub('', text)
+    text = _strip_markdown_links(text)
+    return _QUOTE_RE.sub('', text)
+
+
 def clean_text(text: str) -> str:
     """Clean and normalize text"""
     if not text:
         return ""
-    
-    # Remove URLs
-    text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
-    
-    # Remove Reddit-specific formatting
-    text = re.sub(r'/u/\w+', '', text)  # Remove user mentions
-    text = re.sub(r'/r/\w+', '', text)  # Remove subreddit mentions
-    text = re.sub(r'\[.*?\]\(.*?\)', '', text)  # Remove markdown links
-    text = re.sub(r'&gt;.*', '', text)  # Remove quotes
-    
-    # Clean whitespace
-    text = ' '.join(text.split())
-    
-    return text.strip()
+
+    # Remove URLs, user/subreddit mentions, markdown links and quotes, then clean whitespace
+    return ' '.join(_strip_markup(text).split())
+
+
+def clean_texts(texts: list) -> list:
+    """
+    Clean a whole listing at once; same output as clean_text on each item
+
+    Items are joined on a separator line that none of the patterns can match
+    across, so each pass runs once over the listing instead of once per item.
+    """
+    texts = [text or '' for text in texts]
+    if not texts:
+        return []
+    if any('\x00' in text for text in texts):
+        return [clean_text(text) for text in texts]
+
+    stripped = _strip_markup(_BATCH_SEPARATOR.join(texts)).split(_BATCH_SEPARATOR)
+    return [' '.join(text.split()) for text in stripped]
+
+# Tokenizer word_tokenize applies to each sentence
+_word_tokenizer = NLTKWordTokenizer()
+
+# Sentence boundaries used when the punkt model is not installed
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Treebank splits contractions; these pieces are not words of their own
+_CLITICS = frozenset({"n't", "'s", "'re", "'ve", "'ll", "'d", "'m"})
+
+_stop_words = None
+_hyphenator = None
+
+
+def get_stop_words() -> frozenset:
+    """English stopwords, read from the NLTK corpus once per process"""
+    global _stop_words
+    if _stop_words is None:
+        _stop_words = frozenset(stopwords.words('english'))
+    return _stop_words
+
+
+@lru_cache(maxsize=50000)
+def count_syllables(word: str) -> int:
+    """Syllables in one lowercase word, from pyphen's hyphenation points"""
+    global _hyphenator
+    if _hyphenator is None:
+        _hyphenator = pyphen.Pyphen(lang='en_US')
+    return len(_hyphenator.positions(word)) + 1
+
+
+def split_sentences(text: str) -> list:
+    """Punkt sentences, or a split on sentence-ending punctuation if the model is missing"""
+    try:
+        return sent_tokenize(text)
+    except LookupError:
+        return [sentence for sentence in _SENTENCE_END_RE.split(text.strip()) if sentence]
+
+
+class TextAnalysis:
+    """
+    Linguistic features of one text, derived from a single tokenization
+
+    The text is split into sentences (on its original case, which punkt uses
+    to spot abbreviations and sentence starts) and word-tokenized once; the
+    tokens are lowercased, and keywords, word/sentence counts and readability
+    all read that token stream.
+    """
+
+    __slots__ = ('text', 'sentences', 'tokens')
+
+    def __init__(self, text: str):
+        self.text = text or ""
+        self.sentences = split_sentences(self.text) if self.text.strip() else []
+        self.tokens = [
+            token.lower() for sentence in self.sentences for token in _word_tokenizer.tokenize(sentence)
+        ]
+
+    @property
+    def words(self) -> list:
+        """Word tokens, without punctuation or split-off contraction endings"""
+        return [token for token in self.tokens if token[0].isalnum() and token not in _CLITICS]
+
+    @property
+    def word_count(self) -> int:
+        return len(self.words)
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentences)
+
+    def keywords(self, top_n: int = 10) -> list:
+        """Most frequent non-stopword alphabetic tokens longer than two letters"""
+        stop_words = get_stop_words()
+        keywords = [word for word in self.tokens if word.isalpha() and word not in stop_words and len(word) > 2]
+        return [word for word, count in Counter(keywords).most_common(top_n)]
+
+    @property
+    def readability(self) -> float:
+        """
+        Flesch Reading Ease over this analysis' words and sentences
+
+        Syllables come from pyphen hyphenation points, as in textstat 0.7;
+        words and sentences come from the NLTK tokens rather than textstat's
+        own counting, so scores can differ from textstat by a few points.
+        """
+        words = self.words
+        if not words:
+            return 0.0
+        syllables = sum(count_syllables(word) for word in words)
+        score = 206.835 - 1.015 * (len(words) / max(1, len(self.sentences))) - 84.6 * (syllables / len(words))
+        return round(score, 2)
+
 
 def extract_keywords(text: str, top_n: int = 10) -> list:
     """Extract top keywords from text"""
     if not text:
         return []
-    
-    # Tokenize and clean
-    words = word_tokenize(text.lower())
-    stop_words = set(stopwords.words('english'))
-    
-    # Filter words
-    keywords = [word for word in words if word.isalpha() and word not in stop_words and len(word) > 2]
-    
-    # Count and return top keywords
-    word_freq = Counter(keywords)
-    return [word for word, count in word_freq.most_common(top_n)]
+    return TextAnalysis(text).keywords(top_n)
+
 
 def calculate_readability(text: str) -> float:
     """Calculate Flesch Reading Ease score"""
     if not text:
         return 0.0
-    
+
     try:
-        return flesch_reading_ease(text)
-    except:
-        return 0.0
\ No newline at end of file
+        return TextAnalysis(text).readability
+    except Exception:
+        return 0.0
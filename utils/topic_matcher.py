@@ -0,0 +1,159 @@
+"""
+Topic Matcher Module
+Single-pass, word-boundary-aware multi-keyword topic counting
+"""
+
+import json
+import re
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def load_taxonomy(path: str) -> Dict[str, List[str]]:
+    """
+    Load a taxonomy file: a JSON object mapping topic name to a list of terms
+
+    A term is one or more words matched on word boundaries ("machine learning");
+    a single word ending in ``*`` matches any word with that prefix ("program*").
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        taxonomy = json.load(f)
+
+    if not isinstance(taxonomy, dict) or not all(
+        isinstance(terms, list) and all(isinstance(term, str) for term in terms)
+        for terms in taxonomy.values()
+    ):
+        raise ValueError(f"Topic taxonomy {path} must map topic names to lists of terms")
+    return taxonomy
+
+
+class TopicMatcher:
+    """
+    Counts taxonomy terms in text with one scan, however many terms there are
+
+    Text is split into lowercase words once; exact terms (single words and
+    phrases) run through an Aho-Corasick automaton over words, and prefix
+    terms are resolved per distinct word and memoized. A word shared by
+    several topics counts for each, but each topic counts at most once per
+    word, however many of its terms end there ("mental health" and "health").
+    """
+
+    def __init__(self, taxonomy: Dict[str, List[str]]):
+        self.topics = list(taxonomy)
+
+        # Automaton over words: state 0 is the root
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        prefixes: Dict[str, List[int]] = {}
+        for index, terms in enumerate(taxonomy.values()):
+            for term in terms:
+                term = term.strip().lower()
+                words = _WORD_RE.findall(term)
+                if term.endswith('*') and len(words) == 1:
+                    prefixes.setdefault(words[0], []).append(index)
+                elif words:
+                    self._add_phrase(words, index)
+        self._build_failure_links()
+
+        self._prefixes = {prefix: tuple(indexes) for prefix, indexes in prefixes.items()}
+        self._prefix_lengths = sorted({len(prefix) for prefix in self._prefixes})
+        self._prefix_cache: Dict[str, Tuple[int, ...]] = {}
+        self._cache_lock = threading.Lock()
+
+    def _add_phrase(self, words: List[str], topic_index: int):
+        state = 0
+        for word in words:
+            next_state = self._goto[state].get(word)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][word] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = next_state
+        self._out[state] += (topic_index,)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(word, 0)
+                self._fail[child] = target if target != child else 0
+                # A state also reports every term ending at its failure target
+                self._out[child] += self._out[self._fail[child]]
+
+    def _prefix_hits(self, word: str) -> Tuple[int, ...]:
+        hits = self._prefix_cache.get(word)
+        if hits is None:
+            hits = ()
+            for length in self._prefix_lengths:
+                if length > len(word):
+                    break
+                hits += self._prefixes.get(word[:length], ())
+            with self._cache_lock:
+                if len(self._prefix_cache) >= 100000:
+                    self._prefix_cache.clear()
+                self._prefix_cache[word] = hits
+        return hits
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Term hits per topic in `text`; topics without hits are omitted"""
+        if not text:
+            return {}
+
+        counts = [0] * len(self.topics)
+        goto, fail, out = self._goto, self._fail, self._out
+        has_prefixes = bool(self._prefixes)
+        state = 0
+        for word in _WORD_RE.findall(text.lower()):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            hits = set(out[state])
+            if has_prefixes:
+                hits.update(self._prefix_hits(word))
+            for index in hits:
+                counts[index] += 1
+
+        return {self.topics[i]: n for i, n in enumerate(counts) if n}
+
+    def scan(self, texts: Iterable[str]) -> Tuple[Dict[str, int], List[Dict[str, int]]]:
+        """
+        Count a collection of texts
+
+        Returns:
+            (totals for every topic, per-text hits with zero topics omitted)
+        """
+        totals = dict.fromkeys(self.topics, 0)
+        per_item = []
+        for text in texts:
+            hits = self.count(text)
+            for topic, n in hits.items():
+                totals[topic] += n
+            per_item.append(hits)
+        return totals, per_item
+
+
+_shared_matcher: Optional[TopicMatcher] = None
+_shared_lock = threading.Lock()
+
+
+def get_topic_matcher() -> TopicMatcher:
+    """Return the matcher for the configured taxonomy, built once per process"""
+    global _shared_matcher
+    with _shared_lock:
+        if _shared_matcher is None:
+            from config import TOPIC_TAXONOMY_PATH
+
+            _shared_matcher = TopicMatcher(load_taxonomy(TOPIC_TAXONOMY_PATH))
+        return _shared_matcher